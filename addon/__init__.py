@@ -14,6 +14,7 @@ import bpy
 
 from . import ui
 from . import properties
+from .core.ground import cache as point_cloud_cache
 from .preferences import (
     Preferences,
     InstallDependencyOperator,
@@ -30,6 +31,7 @@ classes = [
 
 def register():
     properties.register()
+    point_cloud_cache.register()
     ui.register()
     for cls in all_operator_classes:
         bpy.utils.register_class(cls)
@@ -38,4 +40,5 @@ def unregister():
     for cls in reversed(all_operator_classes):
         bpy.utils.unregister_class(cls)
     ui.unregister()
+    point_cloud_cache.unregister()
     properties.unregister()
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .camera.setup import setup_cameras, setup_animated_camera
+from .camera.cull import compute_visible_faces, compute_loose_vertices
 from .ground.setup import setup_ground
 from .ground.utils import add_shadow_catcher_ground
 from .object.utils import place_object
+from .render.setup import setup_render_passes
@@ -1,70 +1,70 @@
 import bpy
 import os
+import numpy as np
 from collections import namedtuple
-from mathutils import Matrix, Quaternion
+from mathutils import Matrix
 
-from .utils import copy_camera_object, compute_field_of_view, load_background_image
+from .utils import CameraPose, camera_pose, copy_camera_object, compute_field_of_view, load_background_image
 
 _CameraIntrinsics = namedtuple("CameraIntrinsics", "field_of_view shift_x shift_y")
 
-def _remove_quaternion_discontinuities(target_obj):
+def _remove_quaternion_discontinuities(quaternions):
     # the interpolation of quaternions may lead to discontinuities
     # if the quaternions show different signs
 
     # https://blender.stackexchange.com/questions/58866/keyframe-interpolation-instability
-    action = target_obj.animation_data.action
-
-    # quaternion curves
-    fqw = action.fcurves.find("rotation_quaternion", index=0)
-    fqx = action.fcurves.find("rotation_quaternion", index=1)
-    fqy = action.fcurves.find("rotation_quaternion", index=2)
-    fqz = action.fcurves.find("rotation_quaternion", index=3)
-
-    # invert quaternion so that interpolation takes the shortest path
-    if len(fqw.keyframe_points) > 0:
-        current_quat = Quaternion(
-            (
-                fqw.keyframe_points[0].co[1],
-                fqx.keyframe_points[0].co[1],
-                fqy.keyframe_points[0].co[1],
-                fqz.keyframe_points[0].co[1],
-            )
-        )
+    # flip each quaternion so that it has a non-negative dot product with its
+    # (already flipped) predecessor: the sign is the running product of the flips
+    dots = np.einsum("ij,ij->i", quaternions[1:], quaternions[:-1])
+    flips = np.where(dots < 0, -1.0, 1.0)
+    signs = np.concatenate([[1.0], np.cumprod(flips)])
+    return quaternions * signs[:, None]
 
-        for i in range(len(fqw.keyframe_points) - 1):
-            last_quat = current_quat
-            current_quat = Quaternion(
-                (
-                    fqw.keyframe_points[i + 1].co[1],
-                    fqx.keyframe_points[i + 1].co[1],
-                    fqy.keyframe_points[i + 1].co[1],
-                    fqz.keyframe_points[i + 1].co[1],
-                )
-            )
 
-            if last_quat.dot(current_quat) < 0:
-                current_quat.negate()
-                fqw.keyframe_points[i + 1].co[1] = -fqw.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqx.keyframe_points[i + 1].co[1] = -fqx.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqy.keyframe_points[i + 1].co[1] = -fqy.keyframe_points[
-                    i + 1
-                ].co[1]
-                fqz.keyframe_points[i + 1].co[1] = -fqz.keyframe_points[
-                    i + 1
-                ].co[1]
-
-def _set_fcurve_interpolation(some_obj, interpolation_type="LINEAR"):
+def _interpolation_enum_value(interpolation_type):
     # interpolation_string: ['CONSTANT', 'LINEAR', 'BEZIER', 'SINE',
     # 'QUAD', 'CUBIC', 'QUART', 'QUINT', 'EXPO', 'CIRC',
     # 'BACK', 'BOUNCE', 'ELASTIC']
-    fcurves = some_obj.animation_data.action.fcurves
-    for fcurve in fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = interpolation_type
+    prop = bpy.types.Keyframe.bl_rna.properties["interpolation"]
+    return prop.enum_items[interpolation_type].value
+
+
+def _write_fcurves(id_data, data_path, frames, values, interpolation_type=None):
+    """
+    Write all keyframes of an (array) property in bulk.
+    values: (N, C) array, one column per property index.
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+    if len(frames) == 0:
+        return
+
+    # a single keyframe_insert creates the action and the fcurves the usual way
+    prop = getattr(id_data, data_path)
+    if values.shape[1] == 1 and not hasattr(prop, "__len__"):
+        setattr(id_data, data_path, values[0, 0])
+    else:
+        setattr(id_data, data_path, values[0])
+    id_data.keyframe_insert(data_path=data_path, index=-1, frame=frames[0])
+
+    fcurves = id_data.animation_data.action.fcurves
+    frames = np.asarray(frames, dtype=np.float64)
+    for index in range(values.shape[1]):
+        fcurve = fcurves.find(data_path, index=index)
+        fcurve.keyframe_points.add(len(frames) - 1)
+
+        co = np.empty(len(frames) * 2, dtype=np.float64)
+        co[0::2] = frames
+        co[1::2] = values[:, index]
+        fcurve.keyframe_points.foreach_set("co", co)
+        fcurve.keyframe_points.foreach_set("handle_left", co)
+        fcurve.keyframe_points.foreach_set("handle_right", co)
+
+        if interpolation_type is not None:
+            fcurve.keyframe_points.foreach_set(
+                "interpolation",
+                np.full(len(frames), _interpolation_enum_value(interpolation_type), dtype=np.int32),
+            )
+        fcurve.update()
 
 
 def _add_transformation_animation(
@@ -78,23 +78,36 @@ def _add_transformation_animation(
     scene.frame_end = len(transformations_sorted)
     animated_obj = bpy.data.objects[animated_obj_name]
 
+    frames, locations, quaternions = [], [], []
     for frame_idx, transformation in enumerate(transformations_sorted, start=1):
         if transformation is None:
             continue
 
         loc, rot, _ = Matrix(transformation).decompose()
-        animated_obj.location = loc
-        animated_obj.rotation_mode = "QUATERNION"
-        animated_obj.rotation_quaternion = rot
+        frames.append(frame_idx)
+        locations.append(loc)
+        quaternions.append(rot)
 
-        animated_obj.keyframe_insert(data_path="location", index=-1, frame=frame_idx)
-        animated_obj.keyframe_insert(data_path="rotation_quaternion", index=-1, frame=frame_idx)
+    if not frames:
+        return
 
-        if remove_rotation_discontinuities:
-            _remove_quaternion_discontinuities(animated_obj)
+    locations = np.array(locations, dtype=np.float64)
+    quaternions = np.array(quaternions, dtype=np.float64)
+    if remove_rotation_discontinuities:
+        quaternions = _remove_quaternion_discontinuities(quaternions)
 
-        if interpolation_type is not None:
-            _set_fcurve_interpolation(animated_obj, interpolation_type)
+    animated_obj.rotation_mode = "QUATERNION"
+    _write_fcurves(animated_obj, "location", frames, locations, interpolation_type)
+    _write_fcurves(animated_obj, "rotation_quaternion", frames, quaternions, interpolation_type)
+
+
+def _lens_from_field_of_view(camera_data, field_of_view):
+    # same conversion as setting Camera.angle (fov_to_focallength)
+    if camera_data.sensor_fit == 'VERTICAL':
+        sensor = camera_data.sensor_height
+    else:
+        sensor = camera_data.sensor_width
+    return (sensor / 2.0) / np.tan(np.asarray(field_of_view) / 2.0)
 
 
 def _add_camera_intrinsics_animation(
@@ -102,23 +115,19 @@ def _add_camera_intrinsics_animation(
 ):
     animated_obj = bpy.data.objects[animated_obj_name]
 
-    for frame_idx, intrinsics in enumerate(intrinsics_sorted, start=1):
-        if intrinsics is None:
-            continue
+    frames = [
+        frame_idx for frame_idx, intrinsics in enumerate(intrinsics_sorted, start=1)
+        if intrinsics is not None
+    ]
+    if not frames:
+        return
 
-        animated_obj.data.angle = intrinsics.field_of_view
-        animated_obj.data.shift_x = intrinsics.shift_x
-        animated_obj.data.shift_y = intrinsics.shift_y
+    intrinsics = np.array([i for i in intrinsics_sorted if i is not None], dtype=np.float64)
+    lens = _lens_from_field_of_view(animated_obj.data, intrinsics[:, 0])
 
-        animated_obj.data.keyframe_insert(
-            data_path="lens", index=-1, frame=frame_idx
-        )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_x", index=-1, frame=frame_idx
-        )
-        animated_obj.data.keyframe_insert(
-            data_path="shift_y", index=-1, frame=frame_idx
-        )
+    _write_fcurves(animated_obj.data, "lens", frames, lens)
+    _write_fcurves(animated_obj.data, "shift_x", frames, intrinsics[:, 1])
+    _write_fcurves(animated_obj.data, "shift_y", frames, intrinsics[:, 2])
 
 
 def add_camera_animation(
@@ -126,14 +135,21 @@ def add_camera_animation(
     parent_collection=None,
     interpolation_type="LINEAR",
     remove_rotation_discontinuities=True,
+    template_camera=None,
 ):
-    cameras_sorted = list(cameras)
+    """
+    cameras: camera objects or CameraPose entries (see compute_camera_path).
+    template_camera: camera object copied for a new "Animated Camera";
+    defaults to the first entry when it is an object.
+    """
+    poses = [cam if isinstance(cam, CameraPose) else camera_pose(cam) for cam in cameras]
 
     animated_camera = bpy.data.objects.get("Animated Camera")
     if animated_camera:
         animated_camera.animation_data_clear()
+        animated_camera.data.animation_data_clear()
     else:
-        start_cam = cameras_sorted[0]  
+        start_cam = template_camera or cameras[0]
         if parent_collection is None:
             parent_collection = bpy.data.collections.get("Collection")
         cam_obj = copy_camera_object(
@@ -151,8 +167,8 @@ def add_camera_animation(
     transformations_sorted = []
     camera_intrinsics_sorted = []
 
-    for cam in cameras_sorted:
-        matrix_world = cam.matrix_world.copy()
+    for cam in poses:
+        matrix_world = cam.matrix_world
         fov = compute_field_of_view(cam.data)
 
         width = getattr(cam.data, "width", None)
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+def get_mesh_arrays(mesh):
+    """Read vertex coordinates and the face-vertex index buffer of a mesh in bulk."""
+    n_verts = len(mesh.vertices)
+    co = np.empty(n_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+
+    n_faces = len(mesh.polygons)
+    loop_start = np.empty(n_faces, dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+
+    return co.reshape(-1, 3), loop_start, loop_verts
+
+
+def _view_frame_bounds(scene, cam):
+    # same frame convention as bpy_extras.object_utils.world_to_camera_view
+    frame = [v for v in cam.data.view_frame(scene=scene)]
+    min_x, max_x = frame[2].x, frame[1].x
+    min_y, max_y = frame[1].y, frame[0].y
+    return min_x, max_x, min_y, max_y, -frame[0].z
+
+
+def compute_visible_vertices(scene, cam, points_world, padding=0.2, closer_than_m=0.0):
+    """
+    현재 프레임의 카메라 기준으로 각 vertex가 (padding 포함) 화면 안에 있는지 계산.
+    points_world: (N, 3) world 좌표
+    """
+    near, far = cam.data.clip_start, cam.data.clip_end
+    pad_near = max(closer_than_m, 0.2 * near)
+    pad_far = 0.05 * far
+    z_min = max(closer_than_m, near - pad_near)
+    z_max = far + pad_far
+
+    # depth uses the raw inverse, NDC the scale-free one (as world_to_camera_view does)
+    cam_inv = np.array(cam.matrix_world.inverted())
+    cam_inv_n = np.array(cam.matrix_world.normalized().inverted())
+    transform = np.vstack([cam_inv_n[:3], cam_inv[2:3]])
+
+    local = points_world @ transform[:, :3].T + transform[:, 3]
+    x, y, z_n = local[:, 0], local[:, 1], -local[:, 2]
+    z_cam = -local[:, 3]
+
+    visible = (z_cam >= z_min) & (z_cam <= z_max)
+
+    min_x, max_x, min_y, max_y, frame_z = _view_frame_bounds(scene, cam)
+    if cam.data.type != 'ORTHO':
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = frame_z / z_n
+        x = x * scale
+        y = y * scale
+
+    ndc_x = (x - min_x) / (max_x - min_x)
+    ndc_y = (y - min_y) / (max_y - min_y)
+
+    xmin, xmax = -padding, 1.0 + padding
+    ymin, ymax = -padding, 1.0 + padding
+    visible &= (ndc_x >= xmin) & (ndc_x <= xmax) & (ndc_y >= ymin) & (ndc_y <= ymax)
+    return visible
+
+
+def compute_visible_faces(scene, cam, obj, frames, padding=0.2, closer_than_m=0.0):
+    """
+    sampled frames 중 하나라도 화면에 vertex가 들어오는 face를 True로 표시.
+    Returns (visible_faces, loop_start, loop_verts)
+    """
+    co, loop_start, loop_verts = get_mesh_arrays(obj.data)
+    visible_faces = np.zeros(len(loop_start), dtype=bool)
+    if len(loop_start) == 0:
+        return visible_faces, loop_start, loop_verts
+
+    mw = np.array(obj.matrix_world)
+    points_world = co.astype(np.float64) @ mw[:3, :3].T + mw[:3, 3]
+
+    for fr in frames:
+        if visible_faces.all():
+            break
+        scene.frame_set(fr)
+
+        visible_verts = compute_visible_vertices(
+            scene, cam, points_world, padding=padding, closer_than_m=closer_than_m
+        )
+        visible_faces |= np.logical_or.reduceat(visible_verts[loop_verts], loop_start)
+
+    return visible_faces, loop_start, loop_verts
+
+
+def compute_loose_vertices(n_verts, loop_verts):
+    """Mark vertices that are not referenced by any face."""
+    loose = np.ones(n_verts, dtype=bool)
+    loose[loop_verts] = False
+    return loose
@@ -62,11 +62,15 @@ def setup_animated_camera(cameras, parent_collection):
         return None
 
     path_cameras = compute_camera_path(
-        start_cam, end_cam, number_interpolation_frames=number_interpolation_frames, parent_collection=parent_collection
+        start_cam, end_cam,
+        number_interpolation_frames=number_interpolation_frames,
+        parent_collection=parent_collection,
+        materialize=settings.debug_interp_cameras,
     )
 
     animated_camera = add_camera_animation(
         path_cameras,
+        template_camera=start_cam,
     )
 
     if animated_camera:
@@ -2,8 +2,12 @@ from mathutils import Vector, Matrix
 import math
 import bpy
 import numpy as np
+from collections import namedtuple
 from ..utils import add_obj
 
+# world pose + the camera datablock holding its intrinsics (fx, fy, cx, cy, width, height)
+CameraPose = namedtuple("CameraPose", "matrix_world data")
+
 def compute_field_of_view(camera):
     sensor_extent = max(camera["width"], camera["height"])
     fov = 2 * math.atan(sensor_extent / (2 * camera["fx"]))  # fx는 focal length
@@ -81,21 +85,50 @@ def load_background_image(bg_image, cam_obj):
     background_image.image = bg_image
     background_image.frame_method = "CROP"
 
-def compute_camera_path(start_cam, end_cam, number_interpolation_frames=0, parent_collection=None):
+def camera_pose(cam):
+    return CameraPose(cam.matrix_world.copy(), cam.data)
+
+
+def clear_interp_cameras(parent_collection, collection_name="InterpCams"):
+    """Remove helper cameras left by a previous path (debug mode)."""
+    interp_col = parent_collection.children.get(collection_name)
+    if interp_col is None:
+        return
+    for obj in list(interp_col.objects):
+        cam_data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if cam_data is not None and cam_data.users == 0:
+            bpy.data.cameras.remove(cam_data)
+    bpy.data.collections.remove(interp_col)
+
+
+def _materialize_interp_cameras(start_cam, poses, parent_collection, collection_name="InterpCams"):
+    interp_col = bpy.data.collections.new(collection_name)
+    parent_collection.children.link(interp_col)
+
+    for i, pose in enumerate(poses, start=1):
+        cam_copy = start_cam.copy()
+        cam_copy.data = start_cam.data.copy()
+        cam_copy.name = f"Cam_{i:03d}"
+        interp_col.objects.link(cam_copy)
+        cam_copy.matrix_world = pose.matrix_world
+
+
+def compute_camera_path(start_cam, end_cam, number_interpolation_frames=0, parent_collection=None, materialize=False):
+    """
+    Poses from start_cam to end_cam with interpolated poses in between.
+    Interpolated poses reuse start_cam's intrinsics and are not scene objects
+    unless materialize=True (debug), which links them into "InterpCams".
+    """
     if not start_cam or not end_cam:
         print("[ERROR] Start or End camera is missing.")
         return []
 
-    path_cameras = [start_cam]
-
     if parent_collection is None:
         parent_collection = bpy.context.scene.collection
+    clear_interp_cameras(parent_collection)
 
-    interp_col = parent_collection.children.get("InterpCams")
-    if interp_col is None:
-        interp_col = bpy.data.collections.new("InterpCams")
-        parent_collection.children.link(interp_col)
-
+    interp_poses = []
     if number_interpolation_frames > 0:
         start_loc = np.array(start_cam.matrix_world.translation)
         end_loc = np.array(end_cam.matrix_world.translation)
@@ -109,18 +142,11 @@ def compute_camera_path(start_cam, end_cam, number_interpolation_frames=0, paren
             interp_loc = (1 - t) * start_loc + t * end_loc
             interp_rot = start_rot.slerp(end_rot, t)
 
-            cam_copy = start_cam.copy()
-            cam_copy.data = start_cam.data.copy()
-            cam_copy.name = f"Cam_{i:03d}"
-
-            interp_col.objects.link(cam_copy)
-
             mat = interp_rot.to_matrix().to_4x4()
             mat.translation = interp_loc
-            cam_copy.matrix_world = mat
-
-            path_cameras.append(cam_copy)
+            interp_poses.append(CameraPose(mat, start_cam.data))
 
-    path_cameras.append(end_cam)
-    return path_cameras
+    if materialize and interp_poses:
+        _materialize_interp_cameras(start_cam, interp_poses, parent_collection)
 
+    return [camera_pose(start_cam)] + interp_poses + [camera_pose(end_cam)]
@@ -0,0 +1,99 @@
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from scipy.spatial import cKDTree
+
+
+def read_vertex_coords(mesh):
+    """Local vertex coordinates of a mesh as an (N, 3) array."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3).astype(np.float64)
+
+
+class PointCloud:
+    """World-space points of an object plus a lazily built KD-tree."""
+
+    def __init__(self, local_points, matrix_world):
+        self.matrix_world = matrix_world
+        self.points = local_points @ matrix_world[:3, :3].T + matrix_world[:3, 3]
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = cKDTree(self.points)
+        return self._tree
+
+
+class _CacheEntry:
+    def __init__(self, mesh, local_points):
+        self.mesh_name = mesh.name_full
+        self.mesh_pointer = mesh.as_pointer()
+        self.local_points = local_points
+        self.cloud = None
+
+    def matches(self, mesh):
+        return (
+            self.mesh_pointer == mesh.as_pointer()
+            and len(self.local_points) == len(mesh.vertices)
+        )
+
+
+_cache = {}
+
+
+def get_point_cloud(obj):
+    """
+    Cached world-space point cloud of obj.
+    Mesh coordinates are re-read only when the mesh changes, world points
+    only when matrix_world changes.
+    """
+    mesh = obj.data
+    entry = _cache.get(obj.name_full)
+    if entry is None or not entry.matches(mesh):
+        entry = _CacheEntry(mesh, read_vertex_coords(mesh))
+        _cache[obj.name_full] = entry
+
+    matrix_world = np.array(obj.matrix_world)
+    if entry.cloud is None or not np.array_equal(entry.cloud.matrix_world, matrix_world):
+        entry.cloud = PointCloud(entry.local_points, matrix_world)
+    return entry.cloud
+
+
+def clear_point_cloud_cache():
+    _cache.clear()
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    if not _cache:
+        return
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        data = update.id.original
+        if isinstance(data, bpy.types.Object):
+            _cache.pop(data.name_full, None)
+        elif isinstance(data, bpy.types.Mesh):
+            stale = [name for name, entry in _cache.items() if entry.mesh_name == data.name_full]
+            for name in stale:
+                del _cache[name]
+
+
+@persistent
+def _on_load_post(*_):
+    clear_point_cloud_cache()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    clear_point_cloud_cache()
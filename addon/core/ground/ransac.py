@@ -1,33 +1,88 @@
 import numpy as np
-from sklearn.base import BaseEstimator, RegressorMixin
-from sklearn.linear_model import RANSACRegressor
 
-class PlaneModel(BaseEstimator, RegressorMixin):
-    def fit(self, X, y=None):
-        X_ = np.c_[X, np.ones(X.shape[0])]
-        _, _, Vt = np.linalg.svd(X_)
-        self.coef_ = Vt[-1, :3]
-        self.intercept_ = Vt[-1, 3]
-        return self
+# hypotheses scored per batch; the residual matrix is capped at _MAX_SCORE_ENTRIES
+_BATCH_TRIALS = 64
+_MAX_SCORE_ENTRIES = 4_000_000
+
+
+def fit_plane_least_squares(points):
+    """Total least-squares plane through points. Returns (unit normal, offset)."""
+    centroid = points.mean(axis=0)
+    _, _, Vt = np.linalg.svd(points - centroid, full_matrices=False)
+    normal = Vt[-1]
+    return normal, -normal @ centroid
+
+
+def _planes_from_samples(points, samples):
+    p0, p1, p2 = points[samples[:, 0]], points[samples[:, 1]], points[samples[:, 2]]
+    normals = np.cross(p1 - p0, p2 - p0)
+    norms = np.linalg.norm(normals, axis=1)
+    valid = norms > 1e-12  # repeated or collinear samples
+    normals[valid] /= norms[valid, None]
+    offsets = -np.einsum("ij,ij->i", normals, p0)
+    return normals, offsets, valid
+
+
+def _required_trials(inlier_ratio, confidence, sample_size=3):
+    if inlier_ratio >= 1.0:
+        return 0
+    good_sample = inlier_ratio ** sample_size
+    if good_sample <= 0.0:
+        return np.inf
+    return np.ceil(np.log(1.0 - confidence) / np.log(1.0 - good_sample))
+
+
+def ransac_plane(points, residual_threshold=0.01, max_trials=1000, confidence=0.99, seed=None):
+    """
+    Plane RANSAC over 3-point minimal samples.
+    All samples are drawn up front and hypotheses are scored in batches;
+    stops once enough trials were run for the best inlier ratio at the
+    given confidence, then refits the plane on the final inliers.
+    Returns (unit normal, offset, inlier mask).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(0, n, size=(max_trials, 3))
+
+    batch_size = int(max(1, min(_BATCH_TRIALS, _MAX_SCORE_ENTRIES // max(n, 1))))
+    best_count = 0
+    best_inliers = None
+    required = max_trials
+    trials = 0
+
+    while trials < min(required, max_trials):
+        batch = samples[trials:trials + batch_size]
+        trials += len(batch)
+
+        normals, offsets, valid = _planes_from_samples(points, batch)
+        residuals = np.abs(points @ normals.T + offsets)
+        inliers = residuals <= residual_threshold
+        counts = np.where(valid, inliers.sum(axis=0), 0)
+
+        j = int(np.argmax(counts))
+        if counts[j] > best_count:
+            best_count = int(counts[j])
+            best_inliers = inliers[:, j].copy()
+            required = _required_trials(best_count / n, confidence)
+
+    if best_inliers is None or best_count < 3:
+        raise ValueError("RANSAC could not find a valid plane.")
+
+    normal, offset = fit_plane_least_squares(points[best_inliers])
+    print(f"[INFO] RANSAC: {trials} trials, {best_count}/{n} inliers")
+    return normal, offset, best_inliers
 
-    def predict(self, X):
-        return -(X @ self.coef_ + self.intercept_) / np.linalg.norm(self.coef_)
 
 def fit_ransac_plane_3D(points_all, points_floor, residual_threshold=0.01):
     if len(points_floor) < 3:
         raise ValueError("Not enough floor points for RANSAC.")
 
-    model = RANSACRegressor(
-        estimator=PlaneModel(),
+    normal, _, _ = ransac_plane(
+        points_floor,
         residual_threshold=residual_threshold,
         max_trials=1000,
-        min_samples=4,
     )
-    model.fit(points_floor, np.zeros(len(points_floor)))
-
-    a, b, c = model.estimator_.coef_
-    normal = np.array([a, b, c])
-    normal /= np.linalg.norm(normal)
 
     center_all = np.mean(points_all, axis=0)
     center_floor = np.mean(points_floor, axis=0)
@@ -2,22 +2,23 @@ import os
 import bpy
 import numpy as np
 from PIL import Image
-from scipy.spatial import cKDTree, KDTree
+from scipy.spatial import cKDTree
 
 from .utils import (
     apply_rotation_to_points,
     compute_rotation_matrix_between,
     apply_rotation_to_object,
     translate_object_along_z,
-    get_camera_ray_from_pixel
+    get_camera_rays_from_pixels
 )
+from .cache import get_point_cloud
 from .vis import show_points, draw_points, draw_rays
 from .ransac import fit_ransac_plane_3D
 from ..camera.setup import setup_animated_camera
+from ..utils import timed, reset_timings, report_timings
 
 def compute_ground_z(obj, percentile=20):
-    verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-    z_values = np.array([v.z for v in verts])
+    z_values = get_point_cloud(obj).points[:, 2]
     threshold = np.percentile(z_values, percentile)
     z_filtered = z_values[z_values <= threshold]
 
@@ -28,54 +29,55 @@ def compute_ground_z(obj, percentile=20):
     ground_z = np.median(z_filtered)
     return ground_z
 
-def filter_points(points, radius=0.3, min_neighbors=8):
-    tree = cKDTree(points)
-    mask = np.array([
-        len(tree.query_ball_point(p, r=radius)) >= min_neighbors
-        for p in points
-    ])
-    return points[mask]
+def filter_points(points, radius=0.3, min_neighbors=8, workers=-1):
+    """Radius outlier removal: keep points with at least min_neighbors within radius."""
+    with timed("filter_points"):
+        tree = cKDTree(points)
+        counts = tree.query_ball_point(points, r=radius, return_length=True, workers=workers)
+        return points[counts >= min_neighbors]
 
-def sample_points_from_mask(obj, cam, mask, max_points_per_mask=100, radius=0.5):
+def sample_points_from_mask(obj, cam, mask, max_points_per_mask=100, radius=0.5, num_probes=20, neighbors_per_probe=2):
     if not isinstance(mask, np.ndarray):
         print("[WARN] Mask is not a numpy array")
         return []
 
     ys, xs = np.where(mask > 127)
-    coords = list(zip(xs, ys))
-    if len(coords) == 0:
+    if len(xs) == 0:
         return []
 
-    sampled_indices = np.random.choice(len(coords), min(max_points_per_mask, len(coords)), replace=False)
-    sampled_pixels = [coords[i] for i in sampled_indices]
-    print(f"[INFO] Sampled {len(sampled_pixels)} pixels from mask array")
+    sampled_indices = np.random.choice(len(xs), min(max_points_per_mask, len(xs)), replace=False)
+    print(f"[INFO] Sampled {len(sampled_indices)} pixels from mask array")
 
     width = cam.data["width"]
     height = cam.data["height"]
     pixel_scale_x = width / mask.shape[1]
     pixel_scale_y = height / mask.shape[0]
-    scaled_pixels = [(x * pixel_scale_x, y * pixel_scale_y) for (x, y) in sampled_pixels]
+    scaled_pixels = np.stack([
+        xs[sampled_indices] * pixel_scale_x,
+        ys[sampled_indices] * pixel_scale_y,
+    ], axis=1)
 
-    verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-    points = np.array([v.to_tuple() for v in verts])
-    tree = KDTree(points)
+    cloud = get_point_cloud(obj)
+    points = cloud.points
+    tree = cloud.tree
 
-    candidate_points = set()
-    for i, px in enumerate(scaled_pixels):
-        try:
-            ray_origin, ray_dir = get_camera_ray_from_pixel(cam, px)
-        except Exception as e:
-            print(f"[WARN] Failed to compute ray at pixel {px}: {e}")
-            continue
+    try:
+        ray_origin, ray_dirs = get_camera_rays_from_pixels(cam, scaled_pixels)
+    except Exception as e:
+        print(f"[WARN] Failed to compute rays for {cam.name}: {e}")
+        return []
+
+    # (pixels, probes, 3) → every probe point along every ray at once
+    ts = np.linspace(0.5, 10.0, num_probes)
+    probes = ray_origin + ts[None, :, None] * ray_dirs[:, None, :]
+    probes = probes.reshape(-1, 3)
 
-        for t in np.linspace(0.5, 10.0, 20):
-            probe = ray_origin + t * ray_dir
-            indices = tree.query_ball_point(probe, r=radius)
-            for idx in indices[:2]:
-                pt = tuple(points[idx])
-                candidate_points.add(pt)
+    # nearest few points within radius of each probe (missing neighbours get index len(points))
+    _, indices = tree.query(probes, k=neighbors_per_probe, distance_upper_bound=radius, workers=-1)
+    indices = np.asarray(indices).ravel()
+    indices = indices[indices < len(points)]
 
-    candidate_points = np.array(list(candidate_points))
+    candidate_points = points[np.unique(indices)]
     candidate_points = np.round(candidate_points, 4)
     candidate_points = np.unique(candidate_points, axis=0)
 
@@ -126,9 +128,11 @@ def setup_ground(cameras, animated_camera=None, obj_name="point_cloud", mask_dic
         print(f"[ERROR] Failed to find object: {obj_name}")
         return
 
+    reset_timings()
     if mask_dict:
         print(f"[INFO] Extracting candidate points from masks...")
-        candidate_points = extract_points_from_mask(obj, cameras, mask_dict)
+        with timed("extract_points_from_mask"):
+            candidate_points = extract_points_from_mask(obj, cameras, mask_dict)
     else:
         candidate_points = []
 
@@ -136,10 +140,11 @@ def setup_ground(cameras, animated_camera=None, obj_name="point_cloud", mask_dic
         print(f"[WARN] Not enough candidate points for ground estimation ({len(candidate_points)})")
         return
 
-    verts = [obj.matrix_world @ v.co for v in obj.data.vertices]
-    points = np.array([v.to_tuple() for v in verts])
+    points = get_point_cloud(obj).points
 
-    floor_normal = fit_ransac_plane_3D(points, candidate_points)
+    with timed("ransac"):
+        floor_normal = fit_ransac_plane_3D(points, candidate_points)
+    report_timings()
     rot_mat = compute_rotation_matrix_between(floor_normal, np.array([0, 0, 1]))
     apply_rotation_to_object(obj, rot_mat)
 
@@ -46,6 +46,31 @@ def get_camera_ray_from_pixel(cam, pixel):
     return np.array(ray_origin), np.array(ray_direction)
 
 
+def get_camera_rays_from_pixels(cam, pixels):
+    """
+    get_camera_ray_from_pixel의 배치 버전
+    pixels: (N, 2) 배열 (이미지 기준 x, y)
+    Returns ray_origin (3,), ray_directions (N, 3)
+    """
+    fx = cam.data["fx"]
+    fy = cam.data["fy"]
+    cx = cam.data["cx"]
+    cy = cam.data["cy"]
+
+    pixels = np.asarray(pixels, dtype=np.float64).reshape(-1, 2)
+    rays_camera = np.stack([
+        (pixels[:, 0] - cx) / fx,
+        (cy - pixels[:, 1]) / fy,
+        -np.ones(len(pixels)),
+    ], axis=1)
+
+    rot = np.array(cam.matrix_world.to_3x3())
+    ray_directions = rays_camera @ rot.T
+    ray_directions /= np.linalg.norm(ray_directions, axis=1, keepdims=True)
+
+    return np.array(cam.matrix_world.translation), ray_directions
+
+
 def add_shadow_catcher_ground(size=10.0, z=0.0, name="Plane"):
     # Find or create the plane
     plane = bpy.data.objects.get(name)
@@ -36,8 +36,8 @@ from mathutils import Vector
 
 
 
-def place_object(glb_path: str, set_active=True):
-    """Import GLB file, flatten hierarchy, and normalize scale for all meshes."""
+def place_object(glb_path: str, set_active=True, location=(0.0, 0.0, 0.0)):
+    """Import GLB file, flatten hierarchy, and normalize scale for all meshes. Returns the placed meshes."""
     bpy.ops.import_scene.gltf(filepath=glb_path)
     bpy.context.view_layer.update()
 
@@ -45,7 +45,7 @@ def place_object(glb_path: str, set_active=True):
     imported_objs = bpy.context.selected_objects
     if not imported_objs:
         print("[WARN] No imported objects found.")
-        return
+        return []
 
     # 계층을 flatten (모든 부모 관계 제거)
     for obj in imported_objs:
@@ -55,7 +55,7 @@ def place_object(glb_path: str, set_active=True):
     meshes = [obj for obj in imported_objs if obj.type == 'MESH']
     if not meshes:
         print("[WARN] No mesh found after flattening.")
-        return
+        return []
 
     bpy.context.view_layer.update()
 
@@ -68,7 +68,7 @@ def place_object(glb_path: str, set_active=True):
 
     if not all_coords:
         print("[WARN] No bounding box data.")
-        return
+        return []
 
     xs = [co.x for co in all_coords]
     ys = [co.y for co in all_coords]
@@ -79,7 +79,7 @@ def place_object(glb_path: str, set_active=True):
 
     # 모든 객체 원점 이동 + 동일 스케일 적용
     for obj in meshes:
-        obj.location = (0.0, 0.0, 0.0)
+        obj.location = location
         obj.scale = (scale, scale, scale)
         bpy.context.scene.collection.objects.link(obj)
 
@@ -88,4 +88,5 @@ def place_object(glb_path: str, set_active=True):
             o.select_set(True)
         bpy.context.view_layer.objects.active = meshes[0]
 
-    print(f"[INFO] Placed {len(meshes)} meshes at center with unified scale.")
\ No newline at end of file
+    print(f"[INFO] Placed {len(meshes)} meshes at {tuple(location)} with unified scale.")
+    return meshes
\ No newline at end of file
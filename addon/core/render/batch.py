@@ -0,0 +1,255 @@
+"""
+Headless batch rendering of an exported render job (see GBLEND_OT_render_export).
+
+Launcher (any Python, bpy not needed):
+    python batch.py --job <output_dir>/render_job --workers 4 [--blender /path/to/blender]
+
+Each worker is `blender -b <job>/scene.blend --python batch.py -- --job <job> --frames ...`
+and renders its frames one by one. Frames whose outputs exist and whose scene hash
+(manifest "frame_hashes") matches <output_dir>/render_manifest.json are skipped,
+so an interrupted or re-exported job only renders what changed. Progress goes to <job>/progress.json.
+With an NPY depth format the depth EXRs are stacked into depth.npy once all frames exist.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+MANIFEST_NAME = "manifest.json"
+PROGRESS_NAME = "progress.json"
+# per-frame scene hashes of rendered frames, kept in the output dir
+RENDERED_NAME = "render_manifest.json"
+FRAME_DONE_TAG = "GBLEND_FRAME_DONE"
+
+
+def load_manifest(job_dir):
+    with open(os.path.join(job_dir, MANIFEST_NAME), "r") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def frame_outputs(manifest, frame):
+    """Output files a frame is expected to produce"""
+    return [
+        os.path.join(manifest["output_dir"], pattern.format(frame=frame))
+        for pattern in manifest["outputs"].values()
+    ]
+
+
+def frame_written(manifest, frame, since):
+    """All outputs of a frame exist and were written after `since` (time.time() at render start)"""
+    # whole seconds, some filesystems only keep coarse timestamps
+    since = int(since)
+    return all(
+        os.path.exists(p) and os.path.getsize(p) > 0 and os.path.getmtime(p) >= since
+        for p in frame_outputs(manifest, frame)
+    )
+
+
+def load_rendered(output_dir):
+    """{frame: scene hash} of frames rendered into output_dir"""
+    path = os.path.join(output_dir, RENDERED_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("frames", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_rendered(output_dir, rendered):
+    save_json(os.path.join(output_dir, RENDERED_NAME), {"frames": rendered})
+
+
+def frame_done(manifest, frame, rendered=None):
+    """
+    Outputs exist and, when the job carries frame hashes, the frame was
+    rendered from the same scene state.
+    """
+    if not all(os.path.exists(p) and os.path.getsize(p) > 0 for p in frame_outputs(manifest, frame)):
+        return False
+    hashes = manifest.get("frame_hashes")
+    if not hashes:
+        return True
+    if rendered is None:
+        rendered = load_rendered(manifest["output_dir"])
+    return rendered.get(str(frame)) == hashes.get(str(frame))
+
+
+def all_frames(manifest):
+    return list(range(manifest["frame_start"], manifest["frame_end"] + 1, manifest.get("frame_step", 1)))
+
+
+def pending_frames(manifest):
+    rendered = load_rendered(manifest["output_dir"])
+    return [f for f in all_frames(manifest) if not frame_done(manifest, f, rendered)]
+
+
+def needs_depth_consolidation(manifest):
+    return "depth" in manifest["outputs"] and manifest.get("depth_format", "PNG").startswith("NPY")
+
+
+def split_frames(frames, n):
+    """Contiguous chunks, so each worker keeps its own scene evaluation warm"""
+    n = max(1, min(n, len(frames)))
+    size, extra = divmod(len(frames), n)
+    chunks, start = [], 0
+    for i in range(n):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(frames[start:end])
+        start = end
+    return [c for c in chunks if c]
+
+
+# --------------------
+# Launcher
+# --------------------
+def run_job(job_dir, workers=1, blender=None):
+    manifest = load_manifest(job_dir)
+    blender = blender or manifest.get("blender") or "blender"
+    frames = all_frames(manifest)
+    pending = pending_frames(manifest)
+
+    progress_path = os.path.join(job_dir, PROGRESS_NAME)
+    progress = {
+        "status": "running",
+        "total": len(frames),
+        "done": len(frames) - len(pending),
+        "skipped": len(frames) - len(pending),
+        "failed_workers": [],
+        "started": time.time(),
+        "updated": time.time(),
+    }
+    save_json(progress_path, progress)
+    print(f"[INFO] {len(pending)}/{len(frames)} frames to render with {workers} workers")
+
+    procs = []
+    for i, chunk in enumerate(split_frames(pending, workers)):
+        cmd = [
+            blender, "-b", os.path.join(job_dir, manifest["blend"]),
+            "--python-exit-code", "1",
+            "--python", os.path.abspath(__file__),
+            "--", "--job", job_dir, "--frames", ",".join(map(str, chunk)),
+        ]
+        log = open(os.path.join(job_dir, f"worker_{i}.log"), "w")
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        procs.append((i, proc, log))
+
+    # workers print one tag line per finished frame
+    lock = threading.Lock()
+    rendered = load_rendered(manifest["output_dir"])
+    hashes = manifest.get("frame_hashes", {})
+
+    def pump(i, proc, log):
+        for line in proc.stdout:
+            log.write(line)
+            if line.startswith(FRAME_DONE_TAG):
+                frame = line.split()[1]
+                with lock:
+                    progress["done"] += 1
+                    progress["updated"] = time.time()
+                    save_json(progress_path, progress)
+                    if frame in hashes:
+                        rendered[frame] = hashes[frame]
+                        save_rendered(manifest["output_dir"], rendered)
+        proc.wait()
+        log.close()
+        if proc.returncode != 0:
+            with lock:
+                progress["failed_workers"].append(i)
+
+    threads = [threading.Thread(target=pump, args=p, daemon=True) for p in procs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    progress["status"] = "done" if not pending_frames(manifest) else "incomplete"
+    if progress["status"] == "done" and needs_depth_consolidation(manifest):
+        progress["status"] = "consolidating"
+        save_json(progress_path, progress)
+        cmd = [
+            blender, "-b", "--factory-startup", "--python-exit-code", "1",
+            "--python", os.path.abspath(__file__), "--", "--job", job_dir, "--consolidate",
+        ]
+        with open(os.path.join(job_dir, "consolidate.log"), "w") as log:
+            returncode = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT)
+        progress["status"] = "done" if returncode == 0 else "consolidation_failed"
+    progress["updated"] = time.time()
+    save_json(progress_path, progress)
+    print(f"[INFO] Render job {progress['status']}: {progress['done']}/{progress['total']} frames")
+    return progress["status"] == "done"
+
+
+# --------------------
+# Worker (inside blender -b)
+# --------------------
+def render_frames(job_dir, frames):
+    import bpy
+
+    manifest = load_manifest(job_dir)
+    scene = bpy.context.scene
+    rgb_pattern = manifest["outputs"].get("rgb")
+    rendered = load_rendered(manifest["output_dir"])
+
+    for frame in frames:
+        if frame_done(manifest, frame, rendered):
+            print(f"{FRAME_DONE_TAG} {frame} skipped", flush=True)
+            continue
+        scene.frame_set(frame)
+        if rgb_pattern:
+            scene.render.filepath = os.path.join(manifest["output_dir"], rgb_pattern.format(frame=frame))
+        # File Output node writes the other passes on its own
+        started = time.time()
+        result = bpy.ops.render.render(write_still=bool(rgb_pattern))
+        # the launcher records the frame hash on this tag, so only tag verified frames
+        if result == {'FINISHED'} and frame_written(manifest, frame, started):
+            print(f"{FRAME_DONE_TAG} {frame}", flush=True)
+        else:
+            print(f"[WARN] Frame {frame} failed to render ({', '.join(result)})", flush=True)
+
+
+def consolidate(job_dir):
+    """Stack the depth EXRs of a finished job into depth.npy (needs bpy to read EXR)"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from depth import consolidate_depth_sequence
+
+    manifest = load_manifest(job_dir)
+    consolidate_depth_sequence(
+        manifest["output_dir"], all_frames(manifest), manifest["depth_format"], manifest["outputs"]["depth"]
+    )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="GBlend headless batch renderer")
+    parser.add_argument("--job", required=True, help="render job folder (manifest.json + scene.blend)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--blender", default=None, help="blender executable")
+    parser.add_argument("--frames", default=None, help="worker mode: comma separated frames")
+    parser.add_argument("--consolidate", action="store_true", help="worker mode: build depth.npy from the EXRs")
+    args = parser.parse_args(argv)
+
+    job_dir = os.path.abspath(args.job)
+    if args.consolidate:
+        consolidate(job_dir)
+        return 0
+    if args.frames is not None:
+        render_frames(job_dir, [int(f) for f in args.frames.split(",") if f])
+        return 0
+    return 0 if run_job(job_dir, args.workers, args.blender) else 1
+
+
+if __name__ == "__main__":
+    # blender passes its own arguments before "--"
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(argv))
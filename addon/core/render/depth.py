@@ -0,0 +1,52 @@
+import os
+import json
+import bpy
+import numpy as np
+
+NPY_DTYPES = {"NPY16": np.float16, "NPY32": np.float32}
+
+
+def read_exr_depth(path):
+    """Single-channel float depth of an EXR as an (H, W) float32 array, top row first"""
+    img = bpy.data.images.load(path, check_existing=False)
+    try:
+        img.colorspace_settings.name = 'Non-Color'
+        w, h = img.size
+        pixels = np.empty(w * h * img.channels, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        return pixels.reshape(h, w, img.channels)[::-1, :, 0]
+    finally:
+        bpy.data.images.remove(img)
+
+
+def consolidate_depth(exr_paths, npy_path, frames, dtype=np.float32):
+    """
+    Stack per-frame depth EXRs into one (N, H, W) .npy that training loaders
+    can np.load(..., mmap_mode='r'). Frame numbers go to a sidecar json.
+    Background pixels keep Blender's far value (inf in float16).
+    """
+    first = read_exr_depth(exr_paths[0])
+    tmp_path = npy_path + ".tmp.npy"
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(len(exr_paths),) + first.shape)
+
+    out[0] = first
+    for i, path in enumerate(exr_paths[1:], 1):
+        out[i] = read_exr_depth(path)
+    out.flush()
+    del out
+    os.replace(tmp_path, npy_path)
+
+    with open(os.path.splitext(npy_path)[0] + ".json", "w") as f:
+        json.dump({"frames": list(frames), "dtype": np.dtype(dtype).name, "shape": [len(exr_paths), *first.shape]}, f)
+    print(f"[INFO] Consolidated {len(exr_paths)} depth frames → {npy_path}")
+    return npy_path
+
+
+def consolidate_depth_sequence(output_dir, frames, depth_format, depth_pattern):
+    """Consolidate <output_dir>/depth/depth_####.exr into <output_dir>/depth/depth.npy"""
+    exr_paths = [os.path.join(output_dir, depth_pattern.format(frame=f)) for f in frames]
+    missing = [p for p in exr_paths if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} depth frames missing, e.g. {missing[0]}")
+    npy_path = os.path.join(os.path.dirname(exr_paths[0]), "depth.npy")
+    return consolidate_depth(exr_paths, npy_path, frames, NPY_DTYPES[depth_format])
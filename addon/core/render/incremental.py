@@ -0,0 +1,85 @@
+import json
+import hashlib
+
+from . import batch
+
+# object types whose transform / data can change a rendered frame
+RENDERED_TYPES = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT', 'VOLUME', 'POINTCLOUD', 'CURVES', 'LIGHT'}
+
+
+def _round(values, ndigits=6):
+    return [round(v, ndigits) for v in values]
+
+
+def _matrix(m):
+    return [_round(row) for row in m]
+
+
+def render_settings_state(scene, passes, depth_format="PNG"):
+    """Frame-independent state that changes every output: engine, resolution, passes"""
+    render = scene.render
+    state = {
+        "engine": render.engine,
+        "resolution": [render.resolution_x, render.resolution_y, render.resolution_percentage],
+        "film_transparent": render.film_transparent,
+        "view_transform": scene.view_settings.view_transform,
+        "look": scene.view_settings.look,
+        "exposure": round(scene.view_settings.exposure, 6),
+        "passes": sorted(passes),
+        "depth_format": depth_format,
+    }
+    eevee = getattr(scene, "eevee", None)
+    if eevee is not None:
+        state["eevee_samples"] = getattr(eevee, "taa_render_samples", None)
+    if render.engine == 'CYCLES':
+        state["cycles_samples"] = scene.cycles.samples
+    return state
+
+
+def _frame_state(scene):
+    cam = scene.camera
+    state = {
+        "camera": {
+            "name": cam.name,
+            "matrix": _matrix(cam.matrix_world),
+            "lens": round(cam.data.lens, 6),
+            "sensor": _round([cam.data.sensor_width, cam.data.sensor_height]),
+            "shift": _round([cam.data.shift_x, cam.data.shift_y]),
+            "clip": _round([cam.data.clip_start, cam.data.clip_end]),
+        },
+        "objects": [],
+    }
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        if obj.type not in RENDERED_TYPES or obj.hide_render:
+            continue
+        state["objects"].append([
+            obj.name,
+            _matrix(obj.matrix_world),
+            obj.pass_index,
+            obj.data.name if obj.data else None,
+            [slot.material.name for slot in obj.material_slots if slot.material],
+        ])
+    return state
+
+
+def compute_frame_hashes(scene, frames, passes, depth_format="PNG"):
+    """sha256 per frame over render settings, camera pose and object transforms"""
+    settings_state = json.dumps(render_settings_state(scene, passes, depth_format), sort_keys=True)
+    current = scene.frame_current
+    hashes = {}
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            digest = hashlib.sha256(settings_state.encode())
+            digest.update(json.dumps(_frame_state(scene), sort_keys=True).encode())
+            hashes[str(frame)] = digest.hexdigest()
+    finally:
+        scene.frame_set(current)
+    return hashes
+
+
+def dirty_frames(output_dir, frames, hashes, outputs):
+    """Frames whose stored hash differs or whose output files are missing"""
+    rendered = batch.load_rendered(output_dir)
+    manifest = {"output_dir": output_dir, "outputs": outputs, "frame_hashes": hashes}
+    return [f for f in frames if not batch.frame_done(manifest, f, rendered)]
@@ -0,0 +1,98 @@
+import os
+import bpy
+
+# folder / file prefix of each pass under the output dir
+PASS_OUTPUTS = {
+    "rgb": ("rgb", "rgb_"),
+    "depth": ("depth", "depth_"),
+    "segmentation": ("segmentation", "seg_"),
+}
+
+# depth_format -> EXR color depth; PNG keeps the normalized 8-bit preview,
+# NPY renders float32 EXRs that are consolidated into one .npy afterwards
+DEPTH_EXR_DEPTH = {"EXR16": "16", "EXR32": "32", "NPY16": "32", "NPY32": "32"}
+
+
+def pass_extension(name, depth_format="PNG"):
+    return "exr" if name == "depth" and depth_format in DEPTH_EXR_DEPTH else "png"
+
+
+def pass_output_patterns(passes, output_dir="", depth_format="PNG"):
+    """Per-frame output path of each pass, e.g. {'rgb': 'rgb/rgb_{frame:04d}.png'}"""
+    return {
+        name: os.path.join(
+            output_dir, PASS_OUTPUTS[name][0], PASS_OUTPUTS[name][1] + "{frame:04d}." + pass_extension(name, depth_format)
+        )
+        for name in passes
+    }
+
+
+def _discard_path():
+    """render.filepath target when RGB is not requested (animation renders always write it)"""
+    return os.path.join(bpy.app.tempdir or "/tmp", "gblend_discard", "frame_")
+
+
+def setup_render_passes(scene, output_dir, rgb=True, depth=False, segmentation=False, depth_format="PNG"):
+    """
+    Configure a single animation render that writes every requested pass per frame.
+    RGB goes through render.filepath, Depth / IndexOB through one File Output node.
+    Depth is a normalized PNG, or raw metric Z in a single-channel EXR (depth_format).
+    Returns the list of enabled pass names.
+    """
+    view_layer = scene.view_layers[0]
+    view_layer.use_pass_combined = True
+    view_layer.use_pass_z = depth
+    view_layer.use_pass_object_index = segmentation
+
+    # RGB
+    scene.render.image_settings.file_format = 'PNG'
+    if rgb:
+        folder, prefix = PASS_OUTPUTS["rgb"]
+        os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+        scene.render.filepath = os.path.join(output_dir, folder, prefix)
+    else:
+        scene.render.filepath = _discard_path()
+
+    # Compositor: RLayers -> Composite (+ File Output for the extra passes)
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+
+    rlayers = tree.nodes.new("CompositorNodeRLayers")
+    rlayers.layer = view_layer.name
+    composite = tree.nodes.new("CompositorNodeComposite")
+    tree.links.new(rlayers.outputs["Image"], composite.inputs["Image"])
+
+    passes = ["rgb"] if rgb else []
+    if not (depth or segmentation):
+        return passes
+
+    output = tree.nodes.new("CompositorNodeOutputFile")
+    output.base_path = output_dir
+    output.format.file_format = 'PNG'
+    output.file_slots.clear()
+
+    if depth:
+        folder, prefix = PASS_OUTPUTS["depth"]
+        output.file_slots.new(f"{folder}/{prefix}")
+        if depth_format in DEPTH_EXR_DEPTH:
+            slot = output.file_slots[-1]
+            slot.use_node_format = False
+            slot.format.file_format = 'OPEN_EXR'
+            slot.format.color_mode = 'BW'
+            slot.format.color_depth = DEPTH_EXR_DEPTH[depth_format]
+            slot.format.exr_codec = 'ZIP'
+            tree.links.new(rlayers.outputs["Depth"], output.inputs[-1])
+        else:
+            normalize = tree.nodes.new("CompositorNodeNormalize")
+            tree.links.new(rlayers.outputs["Depth"], normalize.inputs[0])
+            tree.links.new(normalize.outputs[0], output.inputs[-1])
+        passes.append("depth")
+
+    if segmentation:
+        folder, prefix = PASS_OUTPUTS["segmentation"]
+        output.file_slots.new(f"{folder}/{prefix}")
+        tree.links.new(rlayers.outputs["IndexOB"], output.inputs[-1])
+        passes.append("segmentation")
+
+    return passes
@@ -1,4 +1,8 @@
 import bpy
+import time
+from contextlib import contextmanager
+
+_timings = {}
 
 def add_obj(data, obj_name, collection=None):
     """Add an object to the scene."""
@@ -24,4 +28,25 @@ def add_collection(collection_name, parent_collection=None):
     new_collection = bpy.data.collections.new(collection_name)
     parent_collection.children.link(new_collection)
 
-    return new_collection
\ No newline at end of file
+    return new_collection
+
+
+@contextmanager
+def timed(name):
+    """Accumulate wall time and call count under name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        total, calls = _timings.get(name, (0.0, 0))
+        _timings[name] = (total + time.perf_counter() - start, calls + 1)
+
+def get_timings():
+    return {name: {"seconds": total, "calls": calls} for name, (total, calls) in _timings.items()}
+
+def reset_timings():
+    _timings.clear()
+
+def report_timings():
+    for name, (total, calls) in sorted(_timings.items(), key=lambda item: -item[1][0]):
+        print(f"[INFO] Timing {name}: {total * 1000:.1f} ms over {calls} call(s)")
@@ -9,7 +9,9 @@ from .ops_scene_align import GBLEND_OT_scene_align
 from .ops_animated_camera import GBLEND_OT_animated_camera
 from .ops_scene_mode import GBLEND_OT_scene_mode
 from .ops_scene_render import GBLEND_OT_scene_render
+from .ops_render_export import GBLEND_OT_render_export
 from .ops_object_import import GBLEND_OT_object_import
+from .ops_object_batch_import import GBLEND_OT_object_batch_import
 
 all_operator_classes = [
     GBLEND_OT_scene_generate,
@@ -20,5 +22,7 @@ all_operator_classes = [
     GBLEND_OT_animated_camera, 
     GBLEND_OT_scene_mode,
     GBLEND_OT_scene_render,
-    GBLEND_OT_object_import
+    GBLEND_OT_render_export,
+    GBLEND_OT_object_import,
+    GBLEND_OT_object_batch_import
 ]
\ No newline at end of file
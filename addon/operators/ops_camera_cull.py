@@ -1,6 +1,8 @@
 import bpy
 import bmesh
-from bpy_extras.object_utils import world_to_camera_view
+import numpy as np
+
+from ..core import compute_visible_faces, compute_loose_vertices
 
 
 class GBLEND_OT_camera_cull(bpy.types.Operator):
@@ -64,52 +66,30 @@ class GBLEND_OT_camera_cull(bpy.types.Operator):
         n = max(3, int(self.sample_frames))
         frames = [int(round(f0 + i * (f1 - f0) / (n - 1))) for i in range(n)]
 
+        if not me.polygons:
+            self.report({'INFO'}, "No faces to cull.")
+            return {'CANCELLED'}
+
+        visible_face, _, loop_verts = compute_visible_faces(
+            scene, cam, obj, frames,
+            padding=self.padding, closer_than_m=self.closer_than_m,
+        )
+        culled_idx = np.flatnonzero(~visible_face)
+        # 'FACES' delete already drops verts only used by culled faces;
+        # what is left loose are verts that never had a face
+        loose_idx = np.flatnonzero(compute_loose_vertices(len(me.vertices), loop_verts))
+
         bm = bmesh.new()
         bm.from_mesh(me)
         bm.verts.ensure_lookup_table()
         bm.faces.ensure_lookup_table()
 
-        if not bm.faces:
-            bm.free()
-            self.report({'INFO'}, "No faces to cull.")
-            return {'CANCELLED'}
-
-        obj_mw = obj.matrix_world
-        xmin, xmax = -self.padding, 1.0 + self.padding
-        ymin, ymax = -self.padding, 1.0 + self.padding
-
-        near, far = cam.data.clip_start, cam.data.clip_end
-        pad_near = max(self.closer_than_m, 0.2 * near)
-        pad_far = 0.05 * far
-
-        visible_face = [False] * len(bm.faces)
-
-        for fr in frames:
-            scene.frame_set(fr)
-            cam_inv = cam.matrix_world.inverted()
-
-            for fi, f in enumerate(bm.faces):
-                if visible_face[fi]:
-                    continue
-                for v in f.verts:
-                    w = obj_mw @ v.co
-                    z_cam = -(cam_inv @ w).z
-                    if z_cam < max(self.closer_than_m, near - pad_near):
-                        continue
-                    if z_cam > (far + pad_far):
-                        continue
-                    ndc = world_to_camera_view(scene, cam, w)
-                    if xmin <= ndc.x <= xmax and ymin <= ndc.y <= ymax:
-                        visible_face[fi] = True
-                        break
-
-        culled = [f for fi, f in enumerate(bm.faces) if not visible_face[fi]]
-        if culled:
-            bmesh.ops.delete(bm, geom=culled, context='FACES')
-
-        loose = [v for v in bm.verts if not v.link_faces]
+        culled = [bm.faces[i] for i in culled_idx]
+        loose = [bm.verts[i] for i in loose_idx]
         if loose:
             bmesh.ops.delete(bm, geom=loose, context='VERTS')
+        if culled:
+            bmesh.ops.delete(bm, geom=culled, context='FACES')
 
         bm.to_mesh(me)
         bm.free()
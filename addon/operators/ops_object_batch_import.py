@@ -0,0 +1,139 @@
+import bpy
+import json
+import math
+import uuid
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ..core import place_object
+from ..client import create_session, DEFAULT_TIMEOUT
+from ..config import OBJAVERSE_SERVER_URL
+from ..tasks import TaskOperatorMixin
+from .ops_object_import import download_glb, DOWNLOAD_TASK_TIMEOUT
+
+MAX_WORKERS = 6
+
+
+def parse_batch_queries(text):
+    """'chair:3, mug:2, lamp' -> [('chair', 3), ('mug', 2), ('lamp', 1)]"""
+    items = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        query, _, count = part.rpartition(":")
+        if not query or not count.strip().isdigit():
+            query, count = part, "1"
+        items.append((query.strip(), max(1, int(count))))
+    return items
+
+
+class GBLEND_OT_object_batch_import(TaskOperatorMixin, bpy.types.Operator):
+    """Download several GLB objects in parallel and place them on a grid"""
+    bl_idname = "gblend.import_object_batch"
+    bl_label = "Batch Object Import"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        settings = context.scene.settings
+        paths = context.scene.paths
+        return bool(parse_batch_queries(settings.batch_import_queries)) and bool(paths.output_dir.strip())
+
+    def execute(self, context):
+        paths = context.scene.paths
+        settings = context.scene.settings
+
+        output_dir = Path(getattr(paths, "output_dir", ""))
+        if not output_dir.exists():
+            self.report({'ERROR'}, "Invalid project folder.")
+            return {'CANCELLED'}
+
+        objects_dir = output_dir / "objects"
+        objects_dir.mkdir(parents=True, exist_ok=True)
+
+        items = parse_batch_queries(settings.batch_import_queries)
+        self._total = sum(count for _, count in items)
+        self._placed = []
+        self._failed = []
+        self._objects_dir = objects_dir
+        self._spacing = settings.batch_import_spacing
+        self._columns = max(1, math.ceil(math.sqrt(self._total)))
+        self._session = create_session(pool_size=MAX_WORKERS)
+
+        timeout = DOWNLOAD_TASK_TIMEOUT * math.ceil(self._total / MAX_WORKERS)
+        return self.start_task(context, "batch import", self._download_all, items, objects_dir, timeout=timeout)
+
+    def _prefetch(self, task, items):
+        """
+        Ask the server to cache the whole batch up front and return [(query, uid)].
+        Objects the prefetch did not cover (or all of them, if it failed) get uid None
+        and are downloaded by query instead.
+        """
+        task.set_progress(None, "prefetching")
+        try:
+            response = self._session.post(
+                f"{OBJAVERSE_SERVER_URL}/prefetch/",
+                json={"items": [{"query": query, "count": count} for query, count in items]},
+                timeout=DEFAULT_TIMEOUT,
+            )
+            response.raise_for_status()
+            resolved = response.json()["items"]
+        except Exception as e:
+            task.warn(f"Prefetch failed, downloading by query: {e}")
+            resolved = [{"uids": []} for _ in items]
+
+        jobs = []
+        for (query, count), item in zip(items, resolved):
+            uids = item.get("uids", [])[:count]
+            jobs += [(query, uid) for uid in uids]
+            jobs += [(query, None)] * (count - len(uids))
+        return jobs
+
+    def _download_all(self, task, items, objects_dir):
+        """Worker thread: prefetch, stream all GLBs in parallel, queue each placement for the main thread"""
+        jobs = self._prefetch(task, items)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {}
+            for query, uid in jobs:
+                save_path = objects_dir / f"{uuid.uuid4().hex[:8]}_{query.replace(' ', '_')}.glb"
+                futures[pool.submit(download_glb, self._session, query, save_path, uid=uid)] = query
+
+            try:
+                for received, future in enumerate(as_completed(futures), 1):
+                    query = futures[future]
+                    try:
+                        task.call_on_main(self._place, query, future.result())
+                    except Exception as e:
+                        task.warn(f"Download failed for '{query}': {e}")
+                        self._failed.append(query)
+                    task.set_progress(received / self._total, f"{received}/{self._total} downloaded")
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _place(self, query, save_path):
+        i = len(self._placed) + len(self._failed)
+        row, col = divmod(i, self._columns)
+        offset = (self._columns - 1) * self._spacing / 2
+        location = (col * self._spacing - offset, row * self._spacing - offset, 0.0)
+        try:
+            bpy.ops.object.select_all(action='DESELECT')
+            place_object(str(save_path), set_active=True, location=location)
+            self._placed.append((query, save_path))
+        except Exception as e:
+            print(f"[WARN] Placing '{query}' failed: {e}")
+            self._failed.append(query)
+
+    def on_task_done(self, context, result):
+        with open(self._objects_dir / "last_downloaded.json", "w") as f:
+            json.dump([{"text": q, "path": str(p)} for q, p in self._placed], f, indent=2)
+
+        if self._failed:
+            self.report({'WARNING'}, f"Placed {len(self._placed)} objects, {len(self._failed)} failed: {', '.join(self._failed)}")
+        else:
+            self.report({'INFO'}, f"Placed {len(self._placed)} objects")
+        return {'FINISHED'}
+
+    def on_task_finish(self, context):
+        self._session.close()
@@ -1,13 +1,39 @@
 import bpy
 import json
 import uuid
-import requests
 from pathlib import Path
 
 from ..core import place_object
+from ..client import create_session, DEFAULT_TIMEOUT
 from ..config import OBJAVERSE_SERVER_URL
+from ..tasks import TaskOperatorMixin
+
+# server may need to download the asset first
+DOWNLOAD_TASK_TIMEOUT = 300
+
+
+def download_glb(session, query, save_path, task=None, uid=None):
+    """Stream a GLB for query (or a specific uid) from the Objaverse server to save_path"""
+    with session.get(
+        f"{OBJAVERSE_SERVER_URL}/download_glb/",
+        params={"uid": uid} if uid else {"query": query},
+        stream=True,
+        timeout=DEFAULT_TIMEOUT,
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code}")
+        total = int(response.headers.get("Content-Length") or 0)
+        written = 0
+        with open(save_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+                written += len(chunk)
+                if task is not None:
+                    task.set_progress(written / total if total else None, f"{written / 1e6:.1f} MB")
+    return save_path
+
  
-class GBLEND_OT_object_import(bpy.types.Operator):
+class GBLEND_OT_object_import(TaskOperatorMixin, bpy.types.Operator):
     """Download GLB object from server and place in scene"""
     bl_idname = "gblend.import_object"
     bl_label = "Object Import"
@@ -34,28 +60,25 @@ class GBLEND_OT_object_import(bpy.types.Operator):
         objects_dir = output_dir / "objects"
         objects_dir.mkdir(parents=True, exist_ok=True)
 
-        # Request object download
-        try:
-            response = requests.get(
-                f"{OBJAVERSE_SERVER_URL}/download_glb/",
-                params={"query": search_text},
-            )
-            if response.status_code != 200:
-                self.report({'ERROR'}, f"Server error: {response.status_code}")
-                return {'CANCELLED'}
-        except Exception as e:
-            self.report({'ERROR'}, f"Request failed: {e}")
-            return {'CANCELLED'}
-
-        # Save GLB file
         filename = f"{uuid.uuid4().hex[:8]}_{search_text.replace(' ', '_')}.glb"
-        save_path = objects_dir / filename
-        with open(save_path, "wb") as f:
-            f.write(response.content)
+        self._search_text = search_text
+        self._objects_dir = objects_dir
+        self._session = create_session()
+        return self.start_task(
+            context, f"downloading '{search_text}'", self._download, search_text, objects_dir / filename,
+            timeout=DOWNLOAD_TASK_TIMEOUT,
+        )
+
+    def _download(self, task, search_text, save_path):
+        return download_glb(self._session, search_text, save_path, task)
+
+    def on_task_finish(self, context):
+        self._session.close()
 
+    def on_task_done(self, context, save_path):
         # Save metadata
-        with open(objects_dir / "last_downloaded.json", "w") as f:
-            json.dump({"text": search_text, "path": str(save_path)}, f, indent=2)
+        with open(self._objects_dir / "last_downloaded.json", "w") as f:
+            json.dump({"text": self._search_text, "path": str(save_path)}, f, indent=2)
 
         # Place object
         try:
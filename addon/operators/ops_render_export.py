@@ -0,0 +1,86 @@
+import bpy
+import os
+import sys
+import subprocess
+
+from ..core import setup_render_passes
+from ..core.render import batch
+from ..core.render.setup import pass_output_patterns
+from ..core.render.incremental import compute_frame_hashes
+
+
+class GBLEND_OT_render_export(bpy.types.Operator):
+    """Save a self-contained render job (.blend + manifest) and render it with background Blender workers"""
+    bl_idname = "gblend.export_render_job"
+    bl_label = "Export Render Job"
+    bl_options = {'REGISTER'}
+
+    start_workers: bpy.props.BoolProperty(
+        name="Start Workers",
+        description="Launch the background render workers right after exporting",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        scene = context.scene
+        settings = getattr(scene, 'settings', None)
+        paths = getattr(scene, 'paths', None)
+        return (
+            settings
+            and getattr(settings, 'render_mode', '') == 'RENDER'
+            and scene.camera is not None
+            and bool(getattr(paths, 'output_dir', '').strip())
+        )
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.settings
+
+        output_dir = os.path.abspath(bpy.path.abspath(scene.paths.output_dir))
+        job_dir = os.path.join(output_dir, "render_job")
+        os.makedirs(job_dir, exist_ok=True)
+
+        passes = setup_render_passes(
+            scene,
+            output_dir,
+            rgb=settings.save_rgb,
+            depth=settings.save_depth,
+            segmentation=settings.save_segmentation,
+            depth_format=settings.depth_format,
+        )
+        if not passes:
+            self.report({'WARNING'}, "No output selected.")
+            return {'CANCELLED'}
+
+        # copy=True keeps the artist's session on their own file
+        blend_path = os.path.join(job_dir, "scene.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True, relative_remap=True)
+
+        frames = range(scene.frame_start, scene.frame_end + 1, scene.frame_step)
+        manifest = {
+            "blend": "scene.blend",
+            "blender": bpy.app.binary_path,
+            "scene": scene.name,
+            "output_dir": output_dir,
+            "frame_start": scene.frame_start,
+            "frame_end": scene.frame_end,
+            "frame_step": scene.frame_step,
+            "passes": passes,
+            "outputs": pass_output_patterns(passes, depth_format=settings.depth_format),
+            "depth_format": settings.depth_format,
+            # workers skip frames rendered earlier from the same scene state
+            "frame_hashes": compute_frame_hashes(scene, frames, passes, settings.depth_format),
+            "resolution": [scene.render.resolution_x, scene.render.resolution_y],
+        }
+        batch.save_json(os.path.join(job_dir, batch.MANIFEST_NAME), manifest)
+        self.report({'INFO'}, f"Render job exported → {job_dir}")
+
+        if self.start_workers:
+            # Blender's bundled Python runs the launcher, the workers are `blender -b`
+            cmd = [sys.executable, batch.__file__, "--job", job_dir, "--workers", str(settings.render_workers)]
+            with open(os.path.join(job_dir, "launcher.log"), "w") as log:
+                subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            self.report({'INFO'}, f"Started {settings.render_workers} background render workers (progress: {job_dir}/progress.json)")
+
+        return {'FINISHED'}
@@ -1,15 +1,29 @@
 import bpy
+import json
 import random
-import requests
 import shutil
+import zipfile
 from PIL import Image
 from io import BytesIO
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..core import setup_ground, add_shadow_catcher_ground
+from ..client import create_session
 from ..config import GROUNDED_SAM_SERVER_URL 
+from ..tasks import TaskOperatorMixin
 
-class GBLEND_OT_scene_align(bpy.types.Operator):
+MAX_WORKERS = 4
+MASK_RETRIES = 2
+# (connect, read) seconds per image
+MASK_TIMEOUT = (5, 60)
+
+
+class BatchUnsupported(Exception):
+    """Server has no /grounded_sam/batch endpoint"""
+
+
+class GBLEND_OT_scene_align(TaskOperatorMixin, bpy.types.Operator):
     """Estimate ground plane using Grounded SAM and align the scene"""
     bl_idname = "gblend.align_scene"
     bl_label = "Align Scene to Ground"
@@ -21,9 +35,81 @@ class GBLEND_OT_scene_align(bpy.types.Operator):
         obj_name = getattr(settings, "scene_name", "")
         return bool(obj_name and obj_name in bpy.data.objects)
 
+    def _request_masks_batch(self, session, selected_images, dst_images, masks_out):
+        files = []
+        try:
+            for image_path in selected_images:
+                files.append(("images", (image_path.name, open(image_path, "rb"), "image/jpeg")))
+            response = session.post(
+                f"{GROUNDED_SAM_SERVER_URL}/grounded_sam/batch",
+                files=files,
+                timeout=(MASK_TIMEOUT[0], MASK_TIMEOUT[1] * len(selected_images)),
+            )
+        finally:
+            for _, (_, img_file, _) in files:
+                img_file.close()
+
+        if response.status_code in (404, 405):
+            raise BatchUnsupported()
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code} {response.text}")
+
+        by_name = {image_path.name: image_path for image_path in selected_images}
+        mask_dict = {}
+        with zipfile.ZipFile(BytesIO(response.content)) as zf:
+            results = json.loads(zf.read("results.json"))
+            for entry in results:
+                image_path = by_name.get(entry["image"])
+                if image_path is None:
+                    continue
+                if "mask" not in entry:
+                    self._task.warn(f"SAM failed on {image_path.name}: {entry.get('error')}")
+                    continue
+                mask_image = Image.open(BytesIO(zf.read(entry["mask"]))).convert("L")
+                save_path = masks_out / f"{image_path.stem}_mask.png"
+                mask_image.save(save_path)
+                mask_dict[dst_images[image_path]] = save_path
+        return mask_dict
+
+    @staticmethod
+    def _request_mask(session, image_path, masks_out):
+        """Runs in a worker thread; raises on failure so the caller can report it."""
+        with open(image_path, "rb") as img_file:
+            response = session.post(
+                f"{GROUNDED_SAM_SERVER_URL}/grounded_sam/",
+                files={"image": (image_path.name, img_file, "image/jpeg")},
+                timeout=MASK_TIMEOUT,
+            )
+        if response.status_code != 200:
+            raise RuntimeError(f"SAM failed on {image_path.name}: {response.text}")
+
+        mask_image = Image.open(BytesIO(response.content)).convert("L")
+        save_path = masks_out / f"{image_path.stem}_mask.png"
+        mask_image.save(save_path)
+        return save_path
+
+    def _request_masks(self, pool, session, selected_images, dst_images, masks_out):
+        futures = {
+            pool.submit(self._request_mask, session, image_path, masks_out): image_path
+            for image_path in selected_images
+        }
+        mask_dict = {}
+        for future in as_completed(futures):
+            image_path = futures[future]
+            try:
+                mask_dict[dst_images[image_path]] = future.result()
+            except Exception as e:
+                self._task.warn(f"Request failed for {image_path.name}: {e}")
+            self._task.set_progress(len(mask_dict) / len(futures), f"{len(mask_dict)}/{len(futures)} masks")
+        return mask_dict
+
+    @staticmethod
+    def _copy_image(image_path, dst_img):
+        if not dst_img.exists():
+            shutil.copy(image_path, dst_img)
+
     def execute(self, context):
         paths = context.scene.paths
-        settings = context.scene.settings
 
         image_dir = Path(getattr(paths, "data_dir", "")) / "images"
         all_images = list(image_dir.glob("*.jpg")) + list(image_dir.glob("*.png"))
@@ -41,33 +127,44 @@ class GBLEND_OT_scene_align(bpy.types.Operator):
         images_out.mkdir(parents=True, exist_ok=True)
         masks_out.mkdir(parents=True, exist_ok=True)
 
-        # Request SAM masks
-        mask_dict = {}
-        for image_path in selected_images:
+        dst_images = {image_path: images_out / image_path.name for image_path in selected_images}
+        timeout = MASK_TIMEOUT[0] + MASK_TIMEOUT[1] * len(selected_images) * (MASK_RETRIES + 1)
+        return self.start_task(
+            context, "ground alignment", self._fetch_masks, selected_images, dst_images, masks_out, timeout=timeout
+        )
+
+    def _fetch_masks(self, task, selected_images, dst_images, masks_out):
+        """Worker thread: copy the sampled images and request their floor masks"""
+        task.set_progress(None, f"requesting {len(selected_images)} masks")
+
+        # Request SAM masks (one batch request, concurrent per-image requests as fallback).
+        # Local copies run on the same pool while we wait on the network.
+        with create_session(retries=MASK_RETRIES, pool_size=MAX_WORKERS) as session, \
+                ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            copy_futures = [
+                pool.submit(self._copy_image, image_path, dst_img)
+                for image_path, dst_img in dst_images.items()
+            ]
             try:
-                dst_img = images_out / image_path.name
-                if not dst_img.exists():
-                    shutil.copy(image_path, dst_img)
-
-                with open(image_path, "rb") as img_file:
-                    response = requests.post(
-                        f"{GROUNDED_SAM_SERVER_URL}/grounded_sam/",
-                        files={"image": (image_path.name, img_file, "image/jpeg")},
-                    )
-
-                if response.status_code == 200:
-                    mask_image = Image.open(BytesIO(response.content)).convert("L")
-                    save_path = masks_out / f"{image_path.stem}_mask.png"
-                    mask_image.save(save_path)
-                    mask_dict[dst_img] = save_path
-                else:
-                    self.report({'WARNING'}, f"SAM failed on {image_path.name}: {response.text}")
+                mask_dict = self._request_masks_batch(session, selected_images, dst_images, masks_out)
+            except BatchUnsupported:
+                mask_dict = self._request_masks(pool, session, selected_images, dst_images, masks_out)
             except Exception as e:
-                self.report({'WARNING'}, f"Request failed for {image_path.name}: {e}")
+                task.warn(f"Batch request failed: {e}")
+                mask_dict = {}
+
+            for future in copy_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    task.warn(f"Image copy failed: {e}")
 
         if not mask_dict:
-            self.report({'ERROR'}, "No masks returned from Grounded SAM.")
-            return {'CANCELLED'}
+            raise RuntimeError("No masks returned from Grounded SAM.")
+        return mask_dict
+
+    def on_task_done(self, context, mask_dict):
+        settings = context.scene.settings
 
         # Get camera objects
         cameras = [
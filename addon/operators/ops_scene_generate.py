@@ -1,15 +1,348 @@
 import bpy
 
 import os
-import uuid
-import shutil
+import zlib
+import bisect
+import struct
+import hashlib
 import zipfile
-import requests
 
 from ..utils import on_gaussian_dir_changed
+from ..client import create_session, DEFAULT_TIMEOUT
 from ..config import GAUSSIAN_SERVER_URL
+from ..tasks import TaskOperatorMixin
 
-class GBLEND_OT_scene_generate(bpy.types.Operator):
+POLL_INTERVAL = 2.0
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_RETRIES = 5
+# (connect, read) seconds for status polls
+POLL_TIMEOUT = (3, 10)
+# dataset subfolders sent for training
+DATASET_DIRS = ("images", "sparse")
+# upper bound for upload + training + download
+TRAINING_TIMEOUT = 12 * 3600
+
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _crc32_file(path, chunk_size=1024 * 1024):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class StoredZip:
+    """
+    Store-only zip64 archive of dataset files, produced on the fly.
+    The byte layout is fixed up front (sizes, CRCs, offsets), so any range can be
+    regenerated when an upload resumes, and no temporary zip is written to disk.
+    """
+    DOS_DATE = (0 << 9) | (1 << 5) | 1  # 1980-01-01, keeps the layout deterministic
+
+    def __init__(self, root, rel_paths):
+        self._offsets = []
+        self._segments = []  # bytes, or (path, size) for file contents
+        central = []
+        offset = 0
+        for rel_path in rel_paths:
+            path = os.path.join(root, rel_path)
+            name = rel_path.encode("utf-8")
+            size = os.path.getsize(path)
+            crc = _crc32_file(path)
+
+            header = struct.pack(
+                "<4s5H3L2H", b"PK\x03\x04", 45, 0x800, 0, 0, self.DOS_DATE,
+                crc, 0xFFFFFFFF, 0xFFFFFFFF, len(name), 20,
+            ) + name + struct.pack("<2H2Q", 0x0001, 16, size, size)
+            central.append(struct.pack(
+                "<4s6H3L5H2L", b"PK\x01\x02", 45, 45, 0x800, 0, 0, self.DOS_DATE,
+                crc, 0xFFFFFFFF, 0xFFFFFFFF, len(name), 28, 0, 0, 0, 0, 0xFFFFFFFF,
+            ) + name + struct.pack("<2H3Q", 0x0001, 24, size, size, offset))
+
+            offset = self._add(offset, header)
+            offset = self._add(offset, (path, size))
+
+        cd_offset = offset
+        for entry in central:
+            offset = self._add(offset, entry)
+        cd_size = offset - cd_offset
+        n = len(central)
+        eocd64_offset = offset
+        offset = self._add(offset, struct.pack(
+            "<4sQ2H2L4Q", b"PK\x06\x06", 44, 45, 45, 0, 0, n, n, cd_size, cd_offset,
+        ))
+        offset = self._add(offset, struct.pack("<4sLQL", b"PK\x06\x07", 0, eocd64_offset, 1))
+        offset = self._add(offset, struct.pack(
+            "<4s4H2LH", b"PK\x05\x06", 0, 0, 0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0,
+        ))
+        self.size = offset
+
+    def _add(self, offset, segment):
+        self._offsets.append(offset)
+        self._segments.append(segment)
+        return offset + (len(segment) if isinstance(segment, bytes) else segment[1])
+
+    def read(self, offset, length):
+        """Bytes [offset, offset + length) of the archive"""
+        out = bytearray()
+        i = bisect.bisect_right(self._offsets, offset) - 1
+        while length > 0 and i < len(self._segments):
+            segment = self._segments[i]
+            start = offset - self._offsets[i]
+            if isinstance(segment, bytes):
+                data = segment[start:start + length]
+            else:
+                with open(segment[0], "rb") as f:
+                    f.seek(start)
+                    data = f.read(min(length, segment[1] - start))
+            out += data
+            offset += len(data)
+            length -= len(data)
+            i += 1
+        return bytes(out)
+
+
+class SceneGenerationJob:
+    """
+    Worker side of GBLEND_OT_scene_generate. Holds everything the worker thread
+    needs, so it never touches the operator (which Blender frees on cancel).
+    """
+
+    def __init__(self, output_root, auto_preview, on_preview):
+        self.output_root = output_root
+        self.auto_preview = auto_preview
+        self.on_preview = on_preview  # main thread: (preview_dir, iteration)
+        self.session = create_session()
+        self.task = None
+        self.job_id = None
+
+    def _build_manifest(self, dataset_path):
+        """sha256 of every file under images/ and sparse/, keyed by relative posix path"""
+        files = {}
+        for subdir in DATASET_DIRS:
+            for root, _, names in os.walk(os.path.join(dataset_path, subdir)):
+                for name in sorted(names):
+                    self.task.check_cancelled()
+                    full_path = os.path.join(root, name)
+                    rel_path = os.path.relpath(full_path, dataset_path).replace(os.sep, "/")
+                    files[rel_path] = _sha256_file(full_path)
+        return files
+
+    def _register_manifest(self, files, server_url):
+        response = self.session.post(f"{server_url}/gaussian/manifests", json={"files": files}, timeout=DEFAULT_TIMEOUT)
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code} {response.text}")
+        return response.json()
+
+    def _submit_job(self, dataset_path, server_url):
+        """
+        Send the dataset manifest first and upload only files the server does not have.
+        Returns the training job id (possibly an earlier job for an identical dataset).
+        """
+        files = self._build_manifest(dataset_path)
+        manifest = self._register_manifest(files, server_url)
+        manifest_id = manifest["manifest_id"]
+
+        if manifest.get("job"):
+            print(f"[INFO] Identical dataset already submitted (job {manifest['job']['job_id']})")
+            return manifest["job"]["job_id"]
+
+        missing = manifest["missing"]
+        print(f"[INFO] Dataset: {len(files)} files, {len(missing)} to upload")
+        if not missing:
+            response = self.session.post(f"{server_url}/gaussian/manifests/{manifest_id}/jobs", timeout=DEFAULT_TIMEOUT)
+            if response.status_code != 200:
+                raise RuntimeError(f"Server error: {response.status_code} {response.text}")
+            return response.json()["job_id"]
+
+        self.task.set_progress(None, f"indexing {len(missing)} files")
+        archive = StoredZip(dataset_path, missing)
+        return self._upload_zip(archive, server_url, manifest_id)
+
+    def _upload_zip(self, archive, server_url, manifest_id):
+        """Upload the streamed dataset zip in resumable chunks and return the training job id"""
+        size = archive.size
+        response = self.session.post(f"{server_url}/gaussian/uploads", params={"size": size}, timeout=POLL_TIMEOUT)
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code}")
+        upload = response.json()
+        upload_id = upload["upload_id"]
+        chunk_size = upload.get("chunk_size") or UPLOAD_CHUNK_SIZE
+
+        offset = 0
+        failures = 0
+        while offset < size:
+            self.task.set_progress(offset / size, f"uploading {offset / 1e6:.0f}/{size / 1e6:.0f} MB")
+            chunk = archive.read(offset, chunk_size)
+            try:
+                response = self.session.put(
+                    f"{server_url}/gaussian/uploads/{upload_id}",
+                    params={"offset": offset},
+                    data=chunk,
+                    timeout=DEFAULT_TIMEOUT,
+                )
+                if self._upload_closed(response):
+                    return upload_id
+                if response.status_code not in (200, 409):
+                    raise RuntimeError(f"Server error: {response.status_code}")
+                # 409: server holds a different offset, continue from there
+                offset = response.json()["offset"]
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures > UPLOAD_MAX_RETRIES:
+                    raise RuntimeError(f"Upload failed at byte {offset}/{size}: {e}")
+                print(f"[WARN] Upload chunk failed at byte {offset} ({e}), resuming...")
+                self.task.sleep(min(2 ** failures, 30))
+                offset = self._upload_offset(server_url, upload_id, offset)
+
+        response = self.session.post(
+            f"{server_url}/gaussian/uploads/{upload_id}/complete",
+            params={"manifest_id": manifest_id},
+            timeout=DEFAULT_TIMEOUT,
+        )
+        if self._upload_closed(response):
+            return upload_id
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code} {response.text}")
+        return response.json()["job_id"]
+
+    def _upload_closed(self, response):
+        """
+        409 "Upload already completed" (e.g. a retried /complete went through):
+        the upload id is already the job id.
+        Polling that job reports whether it actually started.
+        """
+        if response.status_code != 409:
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        # offset mismatches carry "offset", missing dataset files carry "missing"
+        if "offset" in body or "detail" not in body:
+            return False
+        print(f"[INFO] {body['detail']}")
+        return True
+
+    def _upload_offset(self, server_url, upload_id, fallback):
+        """Last byte offset acknowledged by the server"""
+        try:
+            response = self.session.get(f"{server_url}/gaussian/uploads/{upload_id}", timeout=POLL_TIMEOUT)
+            if response.status_code == 200:
+                return response.json()["offset"]
+        except Exception as e:
+            print(f"[WARN] Failed to query upload offset: {e}")
+        return fallback
+
+    def _poll_job(self, server_url):
+        response = self.session.get(f"{server_url}/gaussian/jobs/{self.job_id}/progress", timeout=POLL_TIMEOUT)
+        if response.status_code != 200:
+            raise RuntimeError(f"Server error: {response.status_code}")
+        return response.json()
+
+    def _download_file(self, url, dest_path):
+        """Stream a server file to disk"""
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with self.session.get(url, stream=True, timeout=DEFAULT_TIMEOUT) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Server error: {response.status_code}")
+            with open(dest_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    self.task.check_cancelled()
+                    f.write(chunk)
+        return dest_path
+
+    def _download_result(self, server_url, output_dir):
+        """Stream the output zip to disk"""
+        return self._download_file(
+            f"{server_url}/gaussian/jobs/{self.job_id}/result",
+            os.path.join(output_dir, "output.zip"),
+        )
+
+    def _extract_output(self, zip_output_path, output_dir):
+        """Unzip server response into output_dir"""
+        with zipfile.ZipFile(zip_output_path, "r") as zip_ref:
+            for member in zip_ref.infolist():
+                self.task.check_cancelled()
+                zip_ref.extract(member, output_dir)
+
+    def run(self, task, data_path):
+        """Worker thread: submit, wait for training, download the result"""
+        self.task = task
+        try:
+            return self._run(task, data_path)
+        finally:
+            # only closed once the worker is done with it, also on cancel / timeout
+            self.session.close()
+
+    def _run(self, task, data_path):
+        # Submit training job (uploads only files missing on the server)
+        task.set_progress(None, "hashing dataset")
+        self.job_id = self._submit_job(data_path, GAUSSIAN_SERVER_URL)
+        print(f"[INFO] Training job submitted: {self.job_id}")
+
+        previewed = False
+        while True:
+            task.sleep(POLL_INTERVAL)
+            try:
+                progress = self._poll_job(GAUSSIAN_SERVER_URL)
+            except Exception as e:
+                # transient network errors: keep polling
+                print(f"[WARN] Failed to poll job {self.job_id}: {e}")
+                continue
+
+            status = progress["status"]
+            if status == "failed":
+                raise RuntimeError(f"job {self.job_id} failed on server: {progress.get('error')}")
+            if status == "done":
+                break
+
+            loss = f" loss={progress['loss']:.4f}" if progress.get("loss") is not None else ""
+            eta = f" ETA {int(progress['eta_seconds']) // 60}m" if progress.get("eta_seconds") is not None else ""
+            task.set_progress(
+                progress["percent"] / 100,
+                f"training {self.job_id} [{status}] {progress['iteration']}/{progress['total_iterations']}{loss}{eta}",
+            )
+
+            if self.auto_preview and not previewed and progress.get("checkpoints"):
+                previewed = True
+                try:
+                    preview_dir = self._download_preview(progress["checkpoints"][0])
+                    task.call_on_main(self.on_preview, preview_dir, progress["checkpoints"][0])
+                except Exception as e:
+                    print(f"[WARN] Preview import failed: {e}")
+
+        # Download and extract output
+        task.set_progress(None, "downloading result")
+        output_dir = os.path.join(self.output_root, "scene")
+        os.makedirs(output_dir, exist_ok=True)
+        zip_output_path = self._download_result(GAUSSIAN_SERVER_URL, output_dir)
+        self._extract_output(zip_output_path, output_dir)
+        return output_dir
+
+    def _download_preview(self, iteration):
+        """Worker thread: download an intermediate checkpoint (+ cameras.json)"""
+        preview_dir = os.path.join(self.output_root, "scene_preview")
+        job_url = f"{GAUSSIAN_SERVER_URL}/gaussian/jobs/{self.job_id}"
+
+        self._download_file(f"{job_url}/cameras", os.path.join(preview_dir, "cameras.json"))
+        self._download_file(
+            f"{job_url}/checkpoints/{iteration}",
+            os.path.join(preview_dir, "point_cloud", f"iteration_{iteration}", "point_cloud.ply"),
+        )
+        return preview_dir
+
+
+class GBLEND_OT_scene_generate(TaskOperatorMixin, bpy.types.Operator):
     """Generate Scene from dataset using Gaussian Splatting server"""
     bl_idname = "gblend.generate_scene"
     bl_label = "Generate Scene"
@@ -20,83 +353,71 @@ class GBLEND_OT_scene_generate(bpy.types.Operator):
         description="Automatically import the generated scene into viewport",
         default=True,
     )
+    preview_import: bpy.props.BoolProperty(
+        name="Preview Import",
+        description="Import the first intermediate checkpoint while training continues, then swap in the final splats",
+        default=True,
+    )
 
     @classmethod
     def poll(cls, context):
         paths = context.scene.paths
         return bool(getattr(paths, "data_dir", "") and os.path.isdir(paths.data_dir))
 
-    def _create_input_zip(self, dataset_path, tmp_dir):
-        """Zip dataset into /tmp directory"""
-        zip_input_path = os.path.join(tmp_dir, "input.zip")
-        shutil.make_archive(zip_input_path.replace(".zip", ""), "zip", dataset_path)
-        return zip_input_path
-
-    def _request_gaussian_server(self, zip_input_path, server_url):
-        """Send dataset zip to server and get output zip"""
-        with open(zip_input_path, "rb") as f:
-            files = {"data": f}
-            response = requests.post(f"{server_url}/gaussian", files=files)
-        if response.status_code != 200:
-            raise RuntimeError(f"Server error: {response.status_code}")
-        return response.content
-
-    def _extract_output(self, zip_bytes, output_dir):
-        """Unzip server response into output_dir"""
-        zip_output_path = os.path.join(output_dir, "output.zip")
-        with open(zip_output_path, "wb") as f:
-            f.write(zip_bytes)
-        with zipfile.ZipFile(zip_output_path, "r") as zip_ref:
-            zip_ref.extractall(output_dir)
-
     def execute(self, context):
-        scene = context.scene
-        paths = scene.paths
-        settings = scene.settings
-
-        data_path = paths.data_dir
-        job_id = str(uuid.uuid4())[:8]
-        tmp_dir = os.path.join("/tmp/gblend", job_id)
-        os.makedirs(tmp_dir, exist_ok=True)
+        paths = context.scene.paths
+        self._preview_objects = []
+        job = SceneGenerationJob(paths.output_dir, self.auto_import and self.preview_import, self._import_preview)
+        return self.start_task(context, "scene generation", job.run, paths.data_dir, timeout=TRAINING_TIMEOUT)
 
-        try:
-            # Create dataset zip
-            zip_input_path = self._create_input_zip(data_path, tmp_dir)
+    def _import_scene(self, import_cameras=True):
+        """Import paths.ply_path and return the newly created splat objects"""
+        before = set(bpy.data.objects)
+        bpy.ops.gblend.import_scene('INVOKE_DEFAULT', import_cameras=import_cameras)
+        bpy.context.view_layer.update()
+        return [obj.name for obj in bpy.data.objects if obj not in before and obj.type != 'CAMERA']
 
-            # Send request to server
-            zip_bytes = self._request_gaussian_server(zip_input_path, GAUSSIAN_SERVER_URL)
+    def _import_preview(self, preview_dir, iteration):
+        paths = bpy.context.scene.paths
+        paths.scene_dir = preview_dir
+        on_gaussian_dir_changed(paths, bpy.context)
+        if os.path.exists(paths.ply_path):
+            self._preview_objects = self._import_scene() or [None]
+            print(f"[INFO] Imported preview from iteration {iteration}")
 
-            # Extract output
-            output_dir = os.path.join(paths.output_dir, "scene")
-            os.makedirs(output_dir, exist_ok=True)
-            self._extract_output(zip_bytes, output_dir)
+    def _remove_preview(self):
+        for name in self._preview_objects:
+            obj = bpy.data.objects.get(name) if name else None
+            if obj is None:
+                continue
+            data = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if isinstance(data, bpy.types.Mesh) and data.users == 0:
+                bpy.data.meshes.remove(data)
 
-            # Update Blender paths
-            paths.scene_dir = output_dir
-            on_gaussian_dir_changed(paths, context)
+    def on_task_done(self, context, output_dir):
+        paths = context.scene.paths
 
-            # Refresh viewport
-            for window in bpy.context.window_manager.windows:
-                for area in window.screen.areas:
-                    area.tag_redraw()
+        # Update Blender paths
+        paths.scene_dir = output_dir
+        on_gaussian_dir_changed(paths, context)
 
-            self.report({'INFO'}, f"Scene generated → {output_dir}")
+        # Refresh viewport
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                area.tag_redraw()
 
-            # Auto Import (PLY import + align_scene)
-            if self.auto_import:
-                ply_path = paths.ply_path  # on_gaussian_dir_changed()에서 설정됨
+        self.report({'INFO'}, f"Scene generated → {output_dir}")
 
-                if os.path.exists(ply_path):
-                    # 1) PLY Import
-                    bpy.ops.gblend.import_scene('INVOKE_DEFAULT')
-                    bpy.context.view_layer.update()
+        # Auto Import (PLY import + align_scene)
+        if self.auto_import:
+            ply_path = paths.ply_path  # on_gaussian_dir_changed()에서 설정됨
 
-                else:
-                    self.report({'WARNING'}, "PLY file not found for auto-import.")
-                    
-            # NOTE: auto_import 여부와 관계없이 여기에서 FINISHED 반환
-            return {'FINISHED'}
+            if os.path.exists(ply_path):
+                # 1) PLY Import (swap out the preview; its cameras are kept)
+                had_preview = bool(self._preview_objects)
+                self._remove_preview()
+                self._import_scene(import_cameras=not had_preview)
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Scene generation failed: {e}")
-            return {'CANCELLED'}
\ No newline at end of file
+            else:
+                self.report({'WARNING'}, "PLY file not found for auto-import.")
@@ -10,6 +10,12 @@ class GBLEND_OT_scene_import(bpy.types.Operator):
     bl_label = "Import Scene (PLY + Cameras)"
     bl_options = {'REGISTER', 'UNDO'}
 
+    import_cameras: bpy.props.BoolProperty(
+        name="Import Cameras",
+        description="Also load reference cameras from cameras.json",
+        default=True,
+    )
+
     @classmethod
     def poll(cls, context):
         paths = context.scene.paths
@@ -102,6 +108,10 @@ class GBLEND_OT_scene_import(bpy.types.Operator):
                         if space.type == "VIEW_3D":
                             space.shading.type = "MATERIAL"
 
+        if not self.import_cameras:
+            self.report({'INFO'}, "Scene imported successfully (PLY).")
+            return {'FINISHED'}
+
         # Load cameras
         json_path = getattr(paths, "camera_path", "")
         image_dir = os.path.join(getattr(paths, "data_dir", ""), "images")
@@ -1,5 +1,13 @@
 import bpy
 import os
+import time
+
+from ..core import setup_render_passes
+from ..core.render.depth import NPY_DTYPES, consolidate_depth_sequence
+from ..core.render.setup import pass_output_patterns
+from ..core.render import batch
+from ..core.render.incremental import compute_frame_hashes, dirty_frames
+
 
 class GBLEND_OT_scene_render(bpy.types.Operator):
     """Render the scene with selected output types"""
@@ -7,6 +15,12 @@ class GBLEND_OT_scene_render(bpy.types.Operator):
     bl_label = "Render Scene"
     bl_options = {'REGISTER', 'UNDO'}
 
+    force: bpy.props.BoolProperty(
+        name="Force",
+        description="Re-render every frame, even if its scene state and outputs are unchanged",
+        default=False,
+    )
+
     @classmethod
     def poll(cls, context):
         scene = context.scene
@@ -32,51 +46,87 @@ class GBLEND_OT_scene_render(bpy.types.Operator):
 
         os.makedirs(output_dir, exist_ok=True)
 
-        if settings.save_rgb:
-            self._render_rgb(scene, os.path.join(output_dir, "rgb"))
-        if settings.save_depth:
-            self._render_depth(scene, os.path.join(output_dir, "depth"))
-        if settings.save_segmentation:
-            self._render_segmentation(scene, os.path.join(output_dir, "segmentation"))
-
-        self.report({'INFO'}, f"Rendering finished (saved in {output_dir})")
+        passes = setup_render_passes(
+            scene,
+            output_dir,
+            rgb=settings.save_rgb,
+            depth=settings.save_depth,
+            segmentation=settings.save_segmentation,
+            depth_format=settings.depth_format,
+        )
+        if not passes:
+            self.report({'WARNING'}, "No output selected.")
+            return {'CANCELLED'}
+
+        frames = list(range(scene.frame_start, scene.frame_end + 1, scene.frame_step))
+        outputs = pass_output_patterns(passes, depth_format=settings.depth_format)
+        hashes = compute_frame_hashes(scene, frames, passes, settings.depth_format)
+        todo = frames if self.force else dirty_frames(output_dir, frames, hashes, outputs)
+
+        if todo:
+            print(f"[INFO] Rendering {len(todo)}/{len(frames)} frames ({len(frames) - len(todo)} unchanged)")
+            done = self._render_frames(scene, output_dir, frames, todo, outputs)
+
+            # only frames that rendered and wrote all their outputs get their hash recorded
+            if done:
+                rendered = batch.load_rendered(output_dir)
+                rendered.update({str(f): hashes[str(f)] for f in done})
+                batch.save_rendered(output_dir, rendered)
+
+            failed = [f for f in todo if f not in done]
+            if failed:
+                self.report({'WARNING'}, f"Rendered {len(done)}/{len(todo)} frames, failed or cancelled: {failed}")
+                return {'CANCELLED'}
+
+        npy_path = os.path.join(output_dir, "depth", "depth.npy")
+        if "depth" in passes and settings.depth_format in NPY_DTYPES and (todo or not os.path.exists(npy_path)):
+            try:
+                consolidate_depth_sequence(output_dir, frames, settings.depth_format, outputs["depth"])
+            except Exception as e:
+                self.report({'ERROR'}, f"Depth consolidation failed: {e}")
+                return {'CANCELLED'}
+
+        if not todo:
+            self.report({'INFO'}, f"All {len(frames)} frames are up to date ({output_dir})")
+            return {'FINISHED'}
+
+        self.report({'INFO'}, f"Rendering finished: {len(todo)} frames ({', '.join(passes)} saved in {output_dir})")
         return {'FINISHED'}
 
-    
-    def _render_rgb(self, scene, out_dir):
-        os.makedirs(out_dir, exist_ok=True)
-        scene.render.image_settings.file_format = 'PNG'
-        scene.render.filepath = os.path.join(out_dir, "rgb_")
-        bpy.ops.render.render(animation=True, write_still=True)
-
-    def _render_depth(self, scene, out_dir):
-        os.makedirs(out_dir, exist_ok=True)
-        scene.use_nodes = True
-        tree = scene.node_tree
-        tree.nodes.clear()
-
-        rlayers = tree.nodes.new("CompositorNodeRLayers")
-        normalize = tree.nodes.new("CompositorNodeNormalize")
-        output = tree.nodes.new("CompositorNodeOutputFile")
-        output.base_path = out_dir
-        output.file_slots[0].path = "depth_"
-
-        tree.links.new(rlayers.outputs["Depth"], normalize.inputs[0])
-        tree.links.new(normalize.outputs[0], output.inputs[0])
-
-        bpy.ops.render.render(animation=True, write_still=True)
-
-    def _render_segmentation(self, scene, out_dir):
-        os.makedirs(out_dir, exist_ok=True)
-        scene.use_nodes = True
-        tree = scene.node_tree
-        tree.nodes.clear()
-
-        rlayers = tree.nodes.new("CompositorNodeRLayers")
-        output = tree.nodes.new("CompositorNodeOutputFile")
-        output.base_path = out_dir
-        output.file_slots[0].path = "seg_"
-
-        tree.links.new(rlayers.outputs["IndexOB"], output.inputs[0])
-
-        bpy.ops.render.render(animation=True, write_still=True)
\ No newline at end of file
+    def _render_frames(self, scene, output_dir, frames, todo, outputs):
+        """Render todo, return the frames whose outputs were actually written"""
+        manifest = {"output_dir": output_dir, "outputs": outputs}
+
+        if todo == frames:
+            # one animation pass writes all outputs per frame
+            started = time.time()
+            result = bpy.ops.render.render(animation=True, write_still=True)
+            if result != {'FINISHED'}:
+                # cancelled or failed: record no frame, they are re-rendered next time
+                print(f"[WARN] Animation render ended with {result}")
+                return []
+            return [f for f in todo if batch.frame_written(manifest, f, started)]
+
+        # only the changed frames; File Output writes the extra passes, RGB path is set per frame
+        current = scene.frame_current
+        rgb_pattern = outputs.get("rgb")
+        filepath = scene.render.filepath
+        done = []
+        try:
+            for frame in todo:
+                scene.frame_set(frame)
+                if rgb_pattern:
+                    scene.render.filepath = os.path.join(output_dir, rgb_pattern.format(frame=frame))
+                started = time.time()
+                result = bpy.ops.render.render(write_still=bool(rgb_pattern))
+                if result != {'FINISHED'}:
+                    print(f"[WARN] Render of frame {frame} ended with {result}")
+                    break
+                if batch.frame_written(manifest, frame, started):
+                    done.append(frame)
+                else:
+                    print(f"[WARN] Frame {frame} rendered but its outputs are missing")
+        finally:
+            scene.render.filepath = filepath
+            scene.frame_set(current)
+        return done
@@ -62,6 +62,16 @@ class SettingsProps(PropertyGroup):
         description="Name of the object to download or place in the scene",
         default=""
     )
+    batch_import_queries: StringProperty(
+        name="Batch Import Queries",
+        description="Comma separated queries with optional counts, e.g. 'chair:3, mug:2, lamp'",
+        default=""
+    )
+    batch_import_spacing: bpy.props.FloatProperty(
+        name="Batch Spacing",
+        description="Grid spacing between objects placed by batch import",
+        default=1.0, min=0.0
+    )
     start_camera: bpy.props.EnumProperty(
         name="Start Camera",
         items=camera_enum_items,
@@ -77,6 +87,11 @@ class SettingsProps(PropertyGroup):
         description="Frames to insert between camera keyframes",
         default=10, min=0
     )
+    debug_interp_cameras: bpy.props.BoolProperty(
+        name="Debug Interpolated Cameras",
+        description="Also create a camera object per interpolated frame in 'InterpCams'",
+        default=False
+    )
     render_mode: EnumProperty(
         name="Render Mode",
         items=[
@@ -110,11 +125,28 @@ class SettingsProps(PropertyGroup):
         default=False,
         description="Save depth maps"
     )
+    depth_format: EnumProperty(
+        name="Depth Format",
+        description="How the depth pass is written",
+        items=[
+            ('PNG', "PNG (normalized)", "8-bit preview, normalized per frame"),
+            ('EXR16', "EXR float16", "Metric depth, half float EXR per frame"),
+            ('EXR32', "EXR float32", "Metric depth, full float EXR per frame"),
+            ('NPY16', "NPY float16", "Metric depth, one memory-mappable depth.npy per sequence"),
+            ('NPY32', "NPY float32", "Metric depth, one memory-mappable depth.npy per sequence"),
+        ],
+        default='PNG'
+    )
     save_segmentation: bpy.props.BoolProperty(
         name="Save Segmentation",
         default=False,
         description="Save object/material segmentation masks"
     )
+    render_workers: IntProperty(
+        name="Render Workers",
+        description="Background Blender processes used by the exported render job",
+        default=2, min=1, max=32
+    )
 
 _classes = (
     PathsProps,
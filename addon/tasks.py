@@ -0,0 +1,203 @@
+import queue
+import threading
+import time
+
+# main-thread time spent on queued bpy calls per timer tick
+MAIN_THREAD_BUDGET = 0.05
+TIMER_INTERVAL = 0.1
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker once its task was cancelled or timed out"""
+
+
+class BackgroundTask:
+    """
+    Runs fn(task, *args) on a worker thread.
+    The worker reports progress with set_progress(), warnings with warn(),
+    and hands anything that touches bpy to the main thread with call_on_main().
+    All of it is consumed by TaskOperatorMixin.modal.
+    """
+
+    def __init__(self, name, fn, *args, timeout=None):
+        self.name = name
+        self.timeout = timeout
+        self.progress = None  # 0..1, None while unknown
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.started = None
+        self._fn = fn
+        self._args = args
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._main_calls = queue.Queue()
+        self._warnings = queue.Queue()
+
+    def start(self):
+        self.started = time.time()
+        threading.Thread(target=self._run, name=f"gblend-{self.name}", daemon=True).start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self._fn(self, *self._args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def timed_out(self):
+        return self.timeout is not None and time.time() - self.started > self.timeout
+
+    def elapsed(self):
+        return time.time() - self.started
+
+    # --- worker side ---
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled(self.name)
+
+    def sleep(self, seconds):
+        """Sleep that wakes up (and raises) on cancellation"""
+        self._cancel.wait(seconds)
+        self.check_cancelled()
+
+    def set_progress(self, progress=None, message=None):
+        self.check_cancelled()
+        self.progress = progress
+        if message is not None:
+            self.message = message
+
+    def warn(self, message):
+        print(f"[WARN] {message}")
+        self._warnings.put(message)
+
+    def call_on_main(self, fn, *args, wait=False):
+        """Queue fn(*args) for the main thread. With wait=True, block and return its result."""
+        self.check_cancelled()
+        slot = {"event": threading.Event()} if wait else None
+        self._main_calls.put((fn, args, slot))
+        if not wait:
+            return None
+        while not slot["event"].wait(TIMER_INTERVAL):
+            self.check_cancelled()
+        if "error" in slot:
+            raise slot["error"]
+        return slot.get("result")
+
+    # --- main thread side ---
+
+    def run_main_calls(self, budget=MAIN_THREAD_BUDGET):
+        start = time.time()
+        while budget is None or time.time() - start < budget:
+            try:
+                fn, args, slot = self._main_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result = fn(*args)
+                if slot is not None:
+                    slot["result"] = result
+            except Exception as e:
+                if slot is None:
+                    print(f"[ERROR] {self.name}: main thread call failed: {e}")
+                else:
+                    slot["error"] = e
+            finally:
+                if slot is not None:
+                    slot["event"].set()
+
+    def pop_warnings(self):
+        warnings = []
+        while True:
+            try:
+                warnings.append(self._warnings.get_nowait())
+            except queue.Empty:
+                return warnings
+
+
+class TaskOperatorMixin:
+    """
+    Modal pump for a BackgroundTask. Operators call start_task() from execute()
+    and implement on_task_done(context, result); it runs on the main thread
+    and may return the operator result set (default {'FINISHED'}).
+    ESC cancels the task, as does exceeding its timeout.
+    """
+
+    def start_task(self, context, name, fn, *args, timeout=None):
+        self._task = BackgroundTask(name, fn, *args, timeout=timeout)
+        self._task.start()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        task = self._task
+
+        if event.type == 'ESC' and event.value == 'PRESS':
+            task.cancel()
+            self.report({'WARNING'}, f"{task.name} cancelled")
+            return self._finish_task(context, {'CANCELLED'})
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        task.run_main_calls()
+        for message in task.pop_warnings():
+            self.report({'WARNING'}, message)
+
+        if task.timed_out():
+            task.cancel()
+            self.report({'ERROR'}, f"{task.name} timed out after {int(task.timeout)}s")
+            return self._finish_task(context, {'CANCELLED'})
+
+        if not task.done:
+            context.workspace.status_text_set(self.task_status_text(task))
+            return {'PASS_THROUGH'}
+
+        task.run_main_calls(budget=None)
+        for message in task.pop_warnings():
+            self.report({'WARNING'}, message)
+
+        if task.error is not None:
+            if not isinstance(task.error, TaskCancelled):
+                self.report({'ERROR'}, f"{task.name} failed: {task.error}")
+            return self._finish_task(context, {'CANCELLED'})
+
+        try:
+            result = self.on_task_done(context, task.result) or {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"{task.name} failed: {e}")
+            result = {'CANCELLED'}
+        return self._finish_task(context, result)
+
+    def task_status_text(self, task):
+        percent = f" {task.progress * 100:.0f}%" if task.progress is not None else ""
+        message = f" {task.message}" if task.message else ""
+        return f"GBlend: {task.name}{percent}{message}  ({int(task.elapsed())}s, ESC to cancel)"
+
+    def on_task_done(self, context, result):
+        return {'FINISHED'}
+
+    def on_task_finish(self, context):
+        """Cleanup hook, runs once however the task ended"""
+
+    def _finish_task(self, context, result):
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+        self.on_task_finish(context)
+        return result
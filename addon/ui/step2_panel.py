@@ -18,5 +18,6 @@ class GBLEND_PT_CameraPanel(bpy.types.Panel):
         col.use_property_split = True
         col.use_property_decorate = False
         col.prop(settings, "interpolation_frames", text="Interpolation")
+        col.prop(settings, "debug_interp_cameras", text="Debug Cameras")
 
         layout.operator("gblend.animate_camera", text="Create Animated Camera")
\ No newline at end of file
@@ -14,4 +14,9 @@ class GBLEND_PT_ObjectPanel(bpy.types.Panel):
         
         box = layout.box()
         box.prop(settings, "import_object_name", text="Search")
-        box.operator("gblend.import_object", text="Download & Place")
\ No newline at end of file
+        box.operator("gblend.import_object", text="Download & Place")
+
+        box = layout.box()
+        box.prop(settings, "batch_import_queries", text="Batch")
+        box.prop(settings, "batch_import_spacing", text="Spacing")
+        box.operator("gblend.import_object_batch", text="Download & Place All")
@@ -33,6 +33,13 @@ class GBLEND_PT_RenderPanel(bpy.types.Panel):
         col = box.column(align=True)
         col.prop(settings, "save_rgb", text="RGB")
         col.prop(settings, "save_depth", text="Depth")
+        sub = col.row()
+        sub.enabled = settings.save_depth
+        sub.prop(settings, "depth_format", text="")
         col.prop(settings, "save_segmentation", text="Segmentation")
 
         layout.operator("gblend.render_scene", text="Render")
+
+        row = layout.row(align=True)
+        row.prop(settings, "render_workers", text="Workers")
+        row.operator("gblend.export_render_job", text="Background Render")
@@ -1,39 +1,641 @@
-from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import FileResponse, JSONResponse
-import os, uuid, zipfile, shutil, subprocess
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Body
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+import os, re, json, time, uuid, queue, hashlib, zipfile, shutil, asyncio, threading, subprocess
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("gblend_server")
 
-app = FastAPI()
-@app.post("/gaussian/")
-async def gaussian_generate(data: UploadFile = File(...)):
-    job_id = str(uuid.uuid4())[:8]
-    work_dir = f"/tmp/gblend_server/{job_id}"
-    os.makedirs(work_dir, exist_ok=True)
+JOB_ROOT = os.environ.get("GBLEND_JOB_ROOT", "/tmp/gblend_server")
+STORE_ROOT = os.environ.get("GBLEND_STORE_ROOT", os.path.join(JOB_ROOT, "store"))
+MAX_CONCURRENT_JOBS = int(os.environ.get("GBLEND_MAX_CONCURRENT_JOBS", "1"))
+TRAIN_ITERATIONS = 30000
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# written into a job's dataset dir once extraction / materialization finished
+DATASET_READY_MARKER = ".gblend_dataset_ready"
 
-    zip_path = os.path.join(work_dir, "input.zip")
-    with open(zip_path, "wb") as f:
-        f.write(await data.read())
+# tqdm line from train.py, e.g.
+# "Training progress:  23%|##  | 7000/30000 [02:10<07:05, 54.03it/s, Loss=0.0523810, Depth Loss=0.0000000]"
+PROGRESS_RE = re.compile(r"Training progress.*?(\d+)/(\d+)")
+ETA_RE = re.compile(r"\[([\d:]+)<([\d:?]+)")
+LOSS_RE = re.compile(r"(?<!Depth )Loss=([0-9.eE+-]+)")
+
+
+# --------------------
+# Job Store
+# --------------------
+class JobStore:
+    """Training jobs, persisted as job.json in each job directory so they survive restarts."""
+
+    def __init__(self, root):
+        self.root = root
+        self._jobs = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    def create(self):
+        job_id = str(uuid.uuid4())[:8]
+        os.makedirs(self.job_dir(job_id), exist_ok=True)
+        job = {
+            "job_id": job_id,
+            "status": "uploading",
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "iteration": 0,
+            "total_iterations": TRAIN_ITERATIONS,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._save(job)
+        return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, persist=True, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields, updated_at=time.time())
+            if persist:
+                self._save(job)
+            return dict(job)
+
+    def load_all(self):
+        """Reload jobs from disk. Returns ids of jobs that still need to run."""
+        pending = []
+        for job_id in sorted(os.listdir(self.root)):
+            path = os.path.join(self.job_dir(job_id), "job.json")
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"[Jobs] Skipping unreadable job {job_id}: {e}")
+                continue
+            # a job interrupted mid-training starts over
+            if job["status"] in ("queued", "running"):
+                job.update(status="queued", iteration=0)
+                pending.append(job_id)
+            with self._lock:
+                self._jobs[job_id] = job
+                self._save(job)
+        return pending
+
+    def _save(self, job):
+        path = os.path.join(self.job_dir(job["job_id"]), "job.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(job, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+# --------------------
+# Content-addressed Dataset Store
+# --------------------
+def sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_id_of(files):
+    canonical = json.dumps(sorted(files.items()), separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DatasetStore:
+    """
+    Dataset files stored once by sha256 (blobs/ab/abcd...), plus manifests
+    (relative path -> sha256) that remember which job trained them.
+    """
+
+    def __init__(self, root):
+        self.blob_root = os.path.join(root, "blobs")
+        self.manifest_root = os.path.join(root, "manifests")
+        self._lock = threading.Lock()
+        os.makedirs(self.blob_root, exist_ok=True)
+        os.makedirs(self.manifest_root, exist_ok=True)
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_root, digest[:2], digest)
+
+    def has_blob(self, digest):
+        return os.path.exists(self.blob_path(digest))
+
+    def add_blob(self, src_path, digest=None):
+        """Move src_path into the store. Returns its sha256."""
+        digest = digest or sha256_file(src_path)
+        dst_path = self.blob_path(digest)
+        if os.path.exists(dst_path):
+            os.remove(src_path)
+        else:
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            os.replace(src_path, dst_path)
+        return digest
+
+    def ingest_zip(self, zip_path, files):
+        """Add the entries of a delta zip, checking each against the manifest."""
+        tmp_dir = zip_path + ".extract"
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            for name in zip_ref.namelist():
+                if name.endswith("/"):
+                    continue
+                if name not in files:
+                    raise ValueError(f"Unexpected file in upload: {name}")
+                extracted = zip_ref.extract(name, tmp_dir)
+                digest = sha256_file(extracted)
+                if digest != files[name]:
+                    raise ValueError(f"Hash mismatch for {name}")
+                self.add_blob(extracted, digest)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def missing(self, files):
+        return sorted({path for path, digest in files.items() if not self.has_blob(digest)})
+
+    def materialize(self, files, dataset_dir):
+        """Lay out a dataset directory from blobs (hard links, copies across filesystems)."""
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        for rel_path, digest in files.items():
+            dst_path = os.path.join(dataset_dir, rel_path)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            try:
+                os.link(self.blob_path(digest), dst_path)
+            except OSError:
+                shutil.copyfile(self.blob_path(digest), dst_path)
+        mark_dataset_ready(dataset_dir)
+
+    def _manifest_path(self, manifest_id):
+        return os.path.join(self.manifest_root, f"{manifest_id}.json")
+
+    def get_manifest(self, manifest_id):
+        path = self._manifest_path(manifest_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest_id, files, job_id=None):
+        with self._lock:
+            path = self._manifest_path(manifest_id)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"files": files, "job_id": job_id}, f)
+            os.replace(tmp_path, path)
+
+
+def _validate_manifest(files):
+    for rel_path, digest in files.items():
+        norm = os.path.normpath(rel_path)
+        if os.path.isabs(norm) or norm.startswith(".."):
+            raise HTTPException(status_code=400, detail=f"Invalid path in manifest: {rel_path}")
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise HTTPException(status_code=400, detail=f"Invalid sha256 for {rel_path}")
 
+
+store = JobStore(JOB_ROOT)
+datasets = DatasetStore(STORE_ROOT)
+job_queue = queue.Queue()
+
+
+def submit_job(job_id):
+    store.update(job_id, status="queued")
+    job_queue.put(job_id)
+    logger.info(f"[Jobs] Queued {job_id} (queue size: {job_queue.qsize()})")
+
+
+# --------------------
+# Training Worker
+# --------------------
+def _read_lines(stream):
+    """Yield output lines, splitting on carriage returns too (tqdm redraws in place)."""
+    buffer = b""
+    while True:
+        chunk = stream.read1(4096) if hasattr(stream, "read1") else stream.read(4096)
+        if not chunk:
+            break
+        buffer += chunk
+        parts = re.split(rb"[\r\n]", buffer)
+        buffer = parts.pop()
+        for part in parts:
+            if part:
+                yield part.decode("utf-8", errors="replace")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace")
+
+
+def _parse_duration(text):
+    """tqdm "MM:SS" / "H:MM:SS" to seconds (None for "?")."""
+    try:
+        seconds = 0
+        for part in text.split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def parse_progress(line):
+    """Iteration, total, loss and ETA from one train.py progress line (None if not a progress line)."""
+    match = PROGRESS_RE.search(line)
+    if not match:
+        return None
+    progress = {"iteration": int(match.group(1)), "total_iterations": int(match.group(2))}
+    eta = ETA_RE.search(line)
+    if eta:
+        progress["elapsed_seconds"] = _parse_duration(eta.group(1))
+        progress["eta_seconds"] = _parse_duration(eta.group(2))
+    loss = LOSS_RE.search(line)
+    if loss:
+        progress["loss"] = float(loss.group(1))
+    return progress
+
+
+def checkpoint_ply_path(job_id, iteration):
+    return os.path.join(
+        store.job_dir(job_id), "output", "point_cloud", f"iteration_{iteration}", "point_cloud.ply"
+    )
+
+
+def saved_iterations(output_dir):
+    """Iterations with a point_cloud.ply on disk (the last one may still be written)"""
+    pc_dir = os.path.join(output_dir, "point_cloud")
+    if not os.path.isdir(pc_dir):
+        return []
+    iterations = []
+    for name in os.listdir(pc_dir):
+        m = re.fullmatch(r"iteration_(\d+)", name)
+        if m and os.path.exists(os.path.join(pc_dir, name, "point_cloud.ply")):
+            iterations.append(int(m.group(1)))
+    return sorted(iterations)
+
+
+def mark_dataset_ready(dataset_dir):
+    """Written last, so a dataset interrupted by a restart is never trained on."""
+    with open(os.path.join(dataset_dir, DATASET_READY_MARKER), "w") as f:
+        f.write(str(time.time()))
+
+
+def prepare_dataset(job_id):
+    """Extract (or re-materialize) the job's dataset unless it was completed before."""
+    work_dir = store.job_dir(job_id)
     dataset_dir = os.path.join(work_dir, "dataset")
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(dataset_dir)
+    if os.path.exists(os.path.join(dataset_dir, DATASET_READY_MARKER)):
+        return dataset_dir
+
+    zip_path = os.path.join(work_dir, "input.zip")
+    manifest_id = (store.get(job_id) or {}).get("manifest_id")
+    if os.path.exists(zip_path):
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            zip_ref.extractall(dataset_dir)
+        mark_dataset_ready(dataset_dir)
+    elif manifest_id:
+        manifest = datasets.get_manifest(manifest_id)
+        if manifest is None or datasets.missing(manifest["files"]):
+            raise RuntimeError(f"Dataset of manifest {manifest_id} is incomplete")
+        datasets.materialize(manifest["files"], dataset_dir)
+    else:
+        raise RuntimeError("No dataset for job")
+    return dataset_dir
 
+
+def run_training(job_id):
+    work_dir = store.job_dir(job_id)
     output_dir = os.path.join(work_dir, "output")
-    try:
-        subprocess.run([
-            "python", "train.py",
+    dataset_dir = prepare_dataset(job_id)
+
+    store.update(job_id, status="running", started_at=time.time(), iteration=0, checkpoints=[])
+
+    last_saved = 0.0
+    checkpoints = []
+    with open(os.path.join(work_dir, "train.log"), "w") as log_file:
+        # train.py's stdout wrapper never flushes; unbuffered so progress arrives while it runs
+        process = subprocess.Popen([
+            "python", "-u", "train.py",
             "-s", dataset_dir,
             "-m", output_dir,
-            "--iterations", "30000"
-        ], check=True, cwd="gaussian-splatting")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"[Training] Failed: {e}")
-        return JSONResponse(status_code=500, content={"error": f"Training failed: {e}"})
+            "--iterations", str(TRAIN_ITERATIONS)
+        ], cwd="gaussian-splatting", stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"})
 
+        for line in _read_lines(process.stdout):
+            log_file.write(line + "\n")
+
+            progress = parse_progress(line)
+            if not progress:
+                continue
+
+            # checkpoints are found on disk; saving is synchronous, so once
+            # training moved past an iteration its PLY is complete
+            done = [it for it in saved_iterations(output_dir) if it < progress["iteration"]]
+            new_checkpoints = done != checkpoints
+            if new_checkpoints:
+                checkpoints = done
+                progress["checkpoints"] = checkpoints
+
+            # persist progress at most every few seconds
+            now = time.time()
+            persist = new_checkpoints or now - last_saved > 5.0
+            if persist:
+                last_saved = now
+            store.update(job_id, persist=persist, **progress)
+        returncode = process.wait()
+
+    if returncode != 0:
+        raise RuntimeError(f"train.py exited with code {returncode}")
+
+    store.update(job_id, checkpoints=saved_iterations(output_dir))
     zip_out_path = os.path.join(work_dir, "output.zip")
     shutil.make_archive(zip_out_path.replace(".zip", ""), 'zip', output_dir)
 
-    return FileResponse(zip_out_path, media_type="application/zip", filename="output.zip")
\ No newline at end of file
+
+def _worker_loop():
+    while True:
+        job_id = job_queue.get()
+        try:
+            logger.info(f"[Training] Started {job_id}")
+            run_training(job_id)
+            store.update(job_id, status="done", finished_at=time.time())
+            logger.info(f"[Training] Finished {job_id}")
+        except Exception as e:
+            logger.error(f"[Training] Failed {job_id}: {e}")
+            store.update(job_id, status="failed", error=str(e), finished_at=time.time())
+        finally:
+            job_queue.task_done()
+
+
+app = FastAPI()
+
+
+@app.on_event("startup")
+def start_workers():
+    for job_id in store.load_all():
+        submit_job(job_id)
+    for i in range(MAX_CONCURRENT_JOBS):
+        threading.Thread(target=_worker_loop, name=f"train-worker-{i}", daemon=True).start()
+
+
+def _get_job_or_404(job_id):
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+# --------------------
+# Job API
+# --------------------
+@app.post("/gaussian/jobs")
+def create_job(data: UploadFile = File(...)):
+    """Submit a COLMAP dataset zip for training. Returns immediately with a job id."""
+    job = store.create()
+    zip_path = os.path.join(store.job_dir(job["job_id"]), "input.zip")
+    with open(zip_path, "wb") as f:
+        shutil.copyfileobj(data.file, f, length=1024 * 1024)
+
+    submit_job(job["job_id"])
+    return store.get(job["job_id"])
+
+
+# --------------------
+# Resumable Upload API
+# --------------------
+def _upload_part_path(job_id):
+    return os.path.join(store.job_dir(job_id), "input.zip.part")
+
+
+def _get_upload_or_404(upload_id):
+    job = _get_job_or_404(upload_id)
+    if job["status"] != "uploading":
+        raise HTTPException(status_code=409, detail=f"Upload already completed (job is {job['status']})")
+    return job
+
+
+def _upload_offset(upload_id):
+    part_path = _upload_part_path(upload_id)
+    return os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+
+@app.post("/gaussian/uploads")
+def create_upload(size: int = Query(None)):
+    """Start a chunked upload of a dataset zip. The upload id becomes the job id."""
+    job = store.create()
+    store.update(job["job_id"], upload_size=size)
+    open(_upload_part_path(job["job_id"]), "wb").close()
+    return {"upload_id": job["job_id"], "offset": 0, "chunk_size": UPLOAD_CHUNK_SIZE}
+
+
+@app.get("/gaussian/uploads/{upload_id}")
+def upload_status(upload_id: str):
+    """Bytes received so far; clients resume from this offset."""
+    job = _get_upload_or_404(upload_id)
+    return {"upload_id": upload_id, "offset": _upload_offset(upload_id), "size": job.get("upload_size")}
+
+
+@app.put("/gaussian/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, offset: int = Query(...)):
+    """Append the request body at offset. Streams to disk; a mismatched offset returns 409 with the real one."""
+    _get_upload_or_404(upload_id)
+    current = _upload_offset(upload_id)
+    if offset != current:
+        return JSONResponse(status_code=409, content={"error": "Offset mismatch", "offset": current})
+
+    part_path = _upload_part_path(upload_id)
+    with open(part_path, "ab") as f:
+        async for chunk in request.stream():
+            f.write(chunk)
+    return {"upload_id": upload_id, "offset": _upload_offset(upload_id)}
+
+
+@app.post("/gaussian/uploads/{upload_id}/complete")
+def complete_upload(upload_id: str, manifest_id: str = Query(None)):
+    """
+    Finish the upload and queue the training job.
+    With manifest_id the upload is a delta zip of the manifest's missing files.
+    """
+    job = _get_upload_or_404(upload_id)
+    received = _upload_offset(upload_id)
+    expected = job.get("upload_size")
+    if expected is not None and received != expected:
+        return JSONResponse(
+            status_code=409,
+            content={"error": f"Upload incomplete ({received}/{expected} bytes)", "offset": received},
+        )
+
+    zip_path = os.path.join(store.job_dir(upload_id), "input.zip")
+    os.replace(_upload_part_path(upload_id), zip_path)
+    if manifest_id is None:
+        submit_job(upload_id)
+        return store.get(upload_id)
+
+    manifest = _get_manifest_or_404(manifest_id)
+    try:
+        datasets.ingest_zip(zip_path, manifest["files"])
+    except (ValueError, zipfile.BadZipFile) as e:
+        store.update(upload_id, status="failed", error=str(e))
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    os.remove(zip_path)
+    return _start_manifest_job(upload_id, manifest_id, manifest["files"])
+
+
+# --------------------
+# Dataset Manifest API
+# --------------------
+def _get_manifest_or_404(manifest_id):
+    manifest = datasets.get_manifest(manifest_id)
+    if manifest is None:
+        raise HTTPException(status_code=404, detail=f"Unknown manifest: {manifest_id}")
+    return manifest
+
+
+def _start_manifest_job(job_id, manifest_id, files):
+    missing = datasets.missing(files)
+    if missing:
+        store.update(job_id, status="failed", error=f"{len(missing)} dataset files missing")
+        return JSONResponse(status_code=409, content={"error": "Dataset files missing", "missing": missing})
+
+    datasets.materialize(files, os.path.join(store.job_dir(job_id), "dataset"))
+    store.update(job_id, manifest_id=manifest_id)
+    datasets.save_manifest(manifest_id, files, job_id=job_id)
+    submit_job(job_id)
+    return store.get(job_id)
+
+
+@app.post("/gaussian/manifests")
+def register_manifest(manifest: dict = Body(...)):
+    """
+    Register a dataset manifest {"files": {relative path: sha256}}.
+    Returns the files the server does not have yet, and the job that already
+    trained (or is training) this exact dataset, if any.
+    """
+    files = manifest.get("files") or {}
+    if not files:
+        raise HTTPException(status_code=400, detail="Empty manifest")
+    _validate_manifest(files)
+
+    manifest_id = manifest_id_of(files)
+    known = datasets.get_manifest(manifest_id)
+    job = store.get(known["job_id"]) if known and known.get("job_id") else None
+    if job is not None and job["status"] == "failed":
+        job = None
+    if known is None or job is None:
+        datasets.save_manifest(manifest_id, files)
+
+    return {"manifest_id": manifest_id, "missing": datasets.missing(files), "job": job}
+
+
+@app.post("/gaussian/manifests/{manifest_id}/jobs")
+def create_manifest_job(manifest_id: str):
+    """Train a registered manifest whose files are all in the store already."""
+    manifest = _get_manifest_or_404(manifest_id)
+    job = store.create()
+    return _start_manifest_job(job["job_id"], manifest_id, manifest["files"])
+
+
+@app.get("/gaussian/jobs/{job_id}")
+def job_status(job_id: str):
+    return _get_job_or_404(job_id)
+
+
+def _progress_of(job):
+    total = job["total_iterations"] or 1
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "iteration": job["iteration"],
+        "total_iterations": job["total_iterations"],
+        "percent": round(100.0 * job["iteration"] / total, 1),
+        "loss": job.get("loss"),
+        "eta_seconds": job.get("eta_seconds"),
+        "checkpoints": job.get("checkpoints", []),
+        "error": job.get("error"),
+    }
+
+
+@app.get("/gaussian/jobs/{job_id}/progress")
+def job_progress(job_id: str):
+    return _progress_of(_get_job_or_404(job_id))
+
+
+@app.get("/gaussian/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events stream of progress updates until the job finishes."""
+    _get_job_or_404(job_id)
+
+    async def stream():
+        last = None
+        while True:
+            progress = _progress_of(store.get(job_id))
+            if progress != last:
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+                last = progress
+            if progress["status"] in ("done", "failed"):
+                break
+            await asyncio.sleep(1.0)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/gaussian/jobs/{job_id}/checkpoints")
+def job_checkpoints(job_id: str):
+    job = _get_job_or_404(job_id)
+    return {"job_id": job_id, "checkpoints": job.get("checkpoints", [])}
+
+
+@app.get("/gaussian/jobs/{job_id}/checkpoints/{iteration}")
+def job_checkpoint(job_id: str, iteration: int):
+    """Intermediate point_cloud.ply, available as soon as train.py has written it."""
+    job = _get_job_or_404(job_id)
+    if iteration not in job.get("checkpoints", []):
+        raise HTTPException(status_code=404, detail=f"No checkpoint for iteration {iteration}")
+    return FileResponse(
+        checkpoint_ply_path(job_id, iteration),
+        media_type="application/octet-stream",
+        filename="point_cloud.ply",
+    )
+
+
+@app.get("/gaussian/jobs/{job_id}/cameras")
+def job_cameras(job_id: str):
+    """cameras.json written by train.py at startup, needed to import a preview."""
+    _get_job_or_404(job_id)
+    cameras_path = os.path.join(store.job_dir(job_id), "output", "cameras.json")
+    if not os.path.exists(cameras_path):
+        raise HTTPException(status_code=404, detail="cameras.json not written yet")
+    return FileResponse(cameras_path, media_type="application/json", filename="cameras.json")
+
+
+@app.get("/gaussian/jobs/{job_id}/result")
+def job_result(job_id: str):
+    job = _get_job_or_404(job_id)
+    if job["status"] != "done":
+        return JSONResponse(status_code=409, content={"error": f"Job is {job['status']}", "status": job["status"]})
+    zip_out_path = os.path.join(store.job_dir(job_id), "output.zip")
+    return FileResponse(zip_out_path, media_type="application/zip", filename="output.zip")
+
+
+@app.post("/gaussian/")
+async def gaussian_generate(data: UploadFile = File(...)):
+    """Blocking variant kept for older clients: submits a job and waits for it without stalling the event loop."""
+    loop = asyncio.get_event_loop()
+    job = await loop.run_in_executor(None, create_job, data)
+    job_id = job["job_id"]
+
+    while True:
+        job = store.get(job_id)
+        if job["status"] in ("done", "failed"):
+            break
+        await asyncio.sleep(5)
+
+    if job["status"] == "failed":
+        return JSONResponse(status_code=500, content={"error": f"Training failed: {job['error']}"})
+    return job_result(job_id)
@@ -8,14 +8,20 @@ sys.path.insert(0, ROOT_DIR)
 from fastapi import FastAPI, UploadFile, File
 from fastapi.responses import FileResponse, JSONResponse
 import cv2
+import json
 import uuid
+import time
+import zipfile
 import torch
 import logging
+import threading
+from collections import OrderedDict
+from typing import List
 import numpy as np
 from pathlib import Path
 from torchvision.ops import box_convert
 
-from grounding_dino.groundingdino.util.inference import load_model, load_image, predict
+from grounding_dino.groundingdino.util.inference import load_model, load_image, preprocess_caption
 from sam2.build_sam import build_sam2
 from sam2.sam2_image_predictor import SAM2ImagePredictor
 
@@ -36,8 +42,124 @@ BOX_THRESHOLD = 0.35
 TEXT_THRESHOLD = 0.25
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
+# 0 = no limit. Models are evicted least-recently-used first when exceeded.
+MODEL_MEMORY_BUDGET_MB = int(os.environ.get("GBLEND_MODEL_MEMORY_MB", "0"))
+# comma separated model names to load at startup, e.g. "sam2,grounding_dino"
+PRELOAD_MODELS = [m.strip() for m in os.environ.get("GBLEND_PRELOAD_MODELS", "").split(",") if m.strip()]
+
+
+# --------------------
+# Model Registry
+# --------------------
+def _module_size_mb(*modules):
+    total = 0
+    for module in modules:
+        if isinstance(module, torch.nn.Module):
+            total += sum(p.numel() * p.element_size() for p in module.parameters())
+            total += sum(b.numel() * b.element_size() for b in module.buffers())
+    return total / (1024 ** 2)
+
+
+def _load_sam2():
+    sam2_model = build_sam2(SAM2_MODEL_CONFIG, SAM2_CHECKPOINT, device=DEVICE)
+    return SAM2ImagePredictor(sam2_model), _module_size_mb(sam2_model)
+
+
+def _load_grounding_dino():
+    grounding_model = load_model(
+        model_config_path=GROUNDING_DINO_CONFIG,
+        model_checkpoint_path=GROUNDING_DINO_CHECKPOINT,
+        device=DEVICE
+    )
+    return grounding_model, _module_size_mb(grounding_model)
+
+
+def _load_sam1():
+    sam = sam_model_registry["vit_h"](checkpoint=SAM1_CHECKPOINT)
+    sam.to(device=DEVICE)
+    return SamAutomaticMaskGenerator(sam), _module_size_mb(sam)
+
+
+def _load_midas():
+    midas = torch.hub.load("intel-isl/MiDaS", "DPT_Large")
+    midas.to(DEVICE).eval()
+    transform = torch.hub.load("intel-isl/MiDaS", "transforms").dpt_transform
+    return (midas, transform), _module_size_mb(midas)
+
+
+class ModelRegistry:
+    """Keeps loaded models resident and shares them across requests."""
+
+    def __init__(self, loaders, memory_budget_mb=0):
+        self.loaders = loaders
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()  # name -> (model, size_mb), LRU order
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                return self._models[name][0]
+
+            if name not in self.loaders:
+                raise KeyError(f"Unknown model: {name}")
+
+            start = time.time()
+            model, size_mb = self.loaders[name]()
+            self._models[name] = (model, size_mb)
+            logger.info(f"[Registry] Loaded {name} ({size_mb:.0f} MB) in {time.time() - start:.1f}s")
+            self._evict(keep=name)
+            return model
+
+    def _evict(self, keep):
+        if self.memory_budget_mb <= 0:
+            return
+        while self.total_mb() > self.memory_budget_mb:
+            victim = next((n for n in self._models if n != keep), None)
+            if victim is None:
+                break
+            _, size_mb = self._models.pop(victim)
+            logger.info(f"[Registry] Evicted {victim} ({size_mb:.0f} MB)")
+            if DEVICE == "cuda":
+                torch.cuda.empty_cache()
+
+    def total_mb(self):
+        return sum(size_mb for _, size_mb in self._models.values())
+
+    def status(self):
+        with self._lock:
+            return {
+                "loaded": {name: round(size_mb, 1) for name, (_, size_mb) in self._models.items()},
+                "total_mb": round(self.total_mb(), 1),
+                "budget_mb": self.memory_budget_mb,
+            }
+
+
+registry = ModelRegistry(
+    {
+        "sam2": _load_sam2,
+        "grounding_dino": _load_grounding_dino,
+        "sam1": _load_sam1,
+        "midas": _load_midas,
+    },
+    memory_budget_mb=MODEL_MEMORY_BUDGET_MB,
+)
+
 app = FastAPI()
 
+
+@app.on_event("startup")
+def preload_models():
+    for name in PRELOAD_MODELS:
+        registry.get(name)
+
+
+@app.get("/models/")
+def models_status():
+    return registry.status()
+
+
 @app.post("/grounded_sam/")
 async def grounded_sam_predict(image: UploadFile = File(...)):
     job_id = str(uuid.uuid4())[:8]
@@ -55,46 +177,84 @@ async def grounded_sam_predict(image: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"[GroundedSAM] Inference failed: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
-    
 
-def grounded_sam_floor(image_path, save_dir):
-    sam2_model = build_sam2(SAM2_MODEL_CONFIG, SAM2_CHECKPOINT, device=DEVICE)
-    sam2_predictor = SAM2ImagePredictor(sam2_model)
-    grounding_model = load_model(
-        model_config_path=GROUNDING_DINO_CONFIG,
-        model_checkpoint_path=GROUNDING_DINO_CHECKPOINT,
-        device=DEVICE
-    )
 
-    image_source, image = load_image(image_path)
-    sam2_predictor.set_image(image_source)
-    h, w, _ = image_source.shape
+@app.post("/grounded_sam/batch")
+async def grounded_sam_predict_batch(images: List[UploadFile] = File(...)):
+    """Floor masks for N images in one request, returned as a zip with results.json"""
+    job_id = str(uuid.uuid4())[:8]
+    tmpdir = Path(f"/tmp/gblend_server/{job_id}")
+    image_dir = tmpdir / "images"
+    mask_dir = tmpdir / "masks"
+    image_dir.mkdir(parents=True, exist_ok=True)
+    mask_dir.mkdir(parents=True, exist_ok=True)
 
-    caption = "floor, ground, ground plane, floor surface"
-    boxes, confidences, labels = predict(
-        model=grounding_model,
-        image=image,
-        caption=caption,
-        box_threshold=BOX_THRESHOLD,
-        text_threshold=TEXT_THRESHOLD,
-        device=DEVICE
-    )
+    try:
+        image_paths = []
+        for image in images:
+            image_path = image_dir / Path(image.filename).name
+            with open(image_path, "wb") as f:
+                f.write(await image.read())
+            image_paths.append(str(image_path))
+
+        results = grounded_sam_floor_batch(image_paths, mask_dir)
+
+        zip_path = tmpdir / "masks.zip"
+        summary = []
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for image_path, (mask_path, error) in zip(image_paths, results):
+                entry = {"image": os.path.basename(image_path)}
+                if mask_path:
+                    entry["mask"] = os.path.basename(mask_path)
+                    zf.write(mask_path, entry["mask"])
+                else:
+                    entry["error"] = error
+                summary.append(entry)
+            zf.writestr("results.json", json.dumps(summary, indent=2))
+
+        return FileResponse(zip_path, media_type="application/zip", filename="masks.zip")
 
-    if boxes.shape[0] == 0:
-        raise ValueError("No floor-like region detected")
+    except Exception as e:
+        logger.error(f"[GroundedSAM] Batch inference failed: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
 
-    boxes = boxes * torch.Tensor([w, h, w, h])
-    input_boxes = box_convert(boxes=boxes, in_fmt="cxcywh", out_fmt="xyxy").numpy()
 
-    with torch.autocast(device_type=DEVICE, dtype=torch.bfloat16):
-        masks, scores, logits = sam2_predictor.predict(
-            point_coords=None,
-            point_labels=None,
-            box=input_boxes,
-            multimask_output=False,
-        )
+def grounded_sam_floor(image_path, save_dir):
+    (mask_path, error), = grounded_sam_floor_batch([image_path], save_dir, mask_names=["mask.png"])
+    if error:
+        raise ValueError(error)
+    return mask_path
+
 
+def predict_batch(model, images, caption, box_threshold):
+    """
+    Batched variant of GroundingDINO `predict`.
+    Images with the same tensor shape run through the model together.
+    Returns a list of (boxes, confidences) in cxcywh / normalized coordinates.
+    """
+    caption = preprocess_caption(caption=caption)
+    groups = {}
+    for i, image in enumerate(images):
+        groups.setdefault(tuple(image.shape), []).append(i)
+
+    results = [None] * len(images)
+    for indices in groups.values():
+        batch = torch.stack([images[i] for i in indices]).to(DEVICE)
+        with torch.no_grad():
+            outputs = model(batch, captions=[caption] * len(indices))
+
+        logits = outputs["pred_logits"].cpu().sigmoid()  # (B, nq, 256)
+        boxes = outputs["pred_boxes"].cpu()  # (B, nq, 4)
+        for j, i in enumerate(indices):
+            confidences = logits[j].max(dim=1)[0]
+            keep = confidences > box_threshold
+            results[i] = (boxes[j][keep], confidences[keep])
+    return results
+
+
+def _select_floor_mask(masks, scores, h, w):
     masks = masks.squeeze(1) if masks.ndim == 4 else masks
+    scores = np.asarray(scores).reshape(len(masks), -1).max(axis=1)
     idx = int(np.argmax(scores))
     mask = (masks[idx] * 255).astype(np.uint8)
 
@@ -115,22 +275,78 @@ def grounded_sam_floor(image_path, save_dir):
     bbox_w, bbox_h = max_x - min_x, max_y - min_y
     if bbox_h > bbox_w:
         raise ValueError("Mask looks vertical (likely a wall)")
-    
-    mask_path = os.path.join(save_dir, "mask.png")
-    cv2.imwrite(mask_path, mask)
-    logger.info(f"[GroundedSAM] Mask saved: {mask_path}")
-    return mask_path
+
+    return mask
+
+
+def grounded_sam_floor_batch(image_paths, save_dir, mask_names=None):
+    """
+    Detect and segment the floor in several images at once.
+    Returns a list of (mask_path, None) or (None, error) per image.
+    """
+    sam2_predictor = registry.get("sam2")
+    grounding_model = registry.get("grounding_dino")
+
+    if mask_names is None:
+        mask_names = [f"{Path(p).stem}_mask.png" for p in image_paths]
+
+    results = [None] * len(image_paths)
+    sources, tensors, loaded = [], [], []
+    for i, image_path in enumerate(image_paths):
+        try:
+            image_source, image = load_image(image_path)
+        except Exception as e:
+            results[i] = (None, f"Failed to load image: {e}")
+            continue
+        sources.append(image_source)
+        tensors.append(image)
+        loaded.append(i)
+
+    caption = "floor, ground, ground plane, floor surface"
+    detections = predict_batch(grounding_model, tensors, caption, BOX_THRESHOLD) if tensors else []
+
+    sam_sources, sam_boxes, sam_indices = [], [], []
+    for image_source, (boxes, _), i in zip(sources, detections, loaded):
+        if boxes.shape[0] == 0:
+            results[i] = (None, "No floor-like region detected")
+            continue
+        h, w, _ = image_source.shape
+        boxes = boxes * torch.Tensor([w, h, w, h])
+        sam_boxes.append(box_convert(boxes=boxes, in_fmt="cxcywh", out_fmt="xyxy").numpy())
+        sam_sources.append(image_source)
+        sam_indices.append(i)
+
+    if sam_sources:
+        sam2_predictor.set_image_batch(sam_sources)
+        with torch.autocast(device_type=DEVICE, dtype=torch.bfloat16):
+            masks_batch, scores_batch, _ = sam2_predictor.predict_batch(
+                point_coords_batch=None,
+                point_labels_batch=None,
+                box_batch=sam_boxes,
+                multimask_output=False,
+            )
+
+        for image_source, masks, scores, i in zip(sam_sources, masks_batch, scores_batch, sam_indices):
+            h, w, _ = image_source.shape
+            try:
+                mask = _select_floor_mask(masks, scores, h, w)
+            except ValueError as e:
+                results[i] = (None, str(e))
+                continue
+
+            mask_path = os.path.join(save_dir, mask_names[i])
+            cv2.imwrite(mask_path, mask)
+            logger.info(f"[GroundedSAM] Mask saved: {mask_path}")
+            results[i] = (mask_path, None)
+
+    return results
 
 # --------------------
 # Segmentation
 # --------------------
 
-def segment_image(image_path, device="cuda"):
-
-    sam = sam_model_registry["vit_h"](checkpoint=SAM1_CHECKPOINT)
-    sam.to(device=device)
-
-    mask_generator = SamAutomaticMaskGenerator(sam)
+def segment_image(image_path):
+    mask_generator = registry.get("sam1")
 
     image_bgr = cv2.imread(str(image_path))
     image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
@@ -158,7 +374,7 @@ async def segment(image: UploadFile = File(...)):
         with open(image_path, "wb") as f:
             f.write(await image.read())
 
-        seg_map = segment_image(str(image_path), DEVICE)
+        seg_map = segment_image(str(image_path))
 
         out_path = tmpdir / "segment.png"
         cv2.imwrite(str(out_path), seg_map)
@@ -173,21 +389,16 @@ async def segment(image: UploadFile = File(...)):
 # --------------------------------------------------------
 # MiDaS Depth Estimation
 # --------------------------------------------------------
-def estimate_depth(image_path, device="cuda"):
-    # Load MiDaS model
-    midas = torch.hub.load("intel-isl/MiDaS", "DPT_Large")
-    midas.to(device).eval()
-
-    # MiDaS transforms
-    transforms = torch.hub.load("intel-isl/MiDaS", "transforms")
-    transform = transforms.dpt_transform
+def estimate_depth(image_path):
+    # MiDaS model + transform (resident)
+    midas, transform = registry.get("midas")
 
     # Load image
     img = cv2.imread(str(image_path))
     img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
     # Preprocess
-    input_batch = transform(img_rgb).to(device)
+    input_batch = transform(img_rgb).to(DEVICE)
 
     with torch.no_grad():
         prediction = midas(input_batch)
@@ -222,7 +433,7 @@ async def depth(image: UploadFile = File(...)):
             f.write(await image.read())
 
         # Run depth estimation
-        depth, depth_map = estimate_depth(str(image_path), DEVICE)
+        depth, depth_map = estimate_depth(str(image_path))
 
         # Save visualization image
         out_path = tmpdir / "depth.png"
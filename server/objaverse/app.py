@@ -1,31 +1,125 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Body, HTTPException
 from fastapi.responses import FileResponse, JSONResponse
 import os
 import json
 import gzip
 import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
 import torch
 import random
 import logging
 import requests
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from transformers import CLIPProcessor, CLIPModel
 
+try:
+    import faiss
+except ImportError:  # optional: search falls back to brute force over the memmap
+    faiss = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("gblend_server")
 
 OBJ_PATHS_URL = "https://huggingface.co/datasets/allenai/objaverse/resolve/main/object-paths.json.gz"
 LVIS_URL = "https://huggingface.co/datasets/allenai/objaverse/resolve/main/lvis-annotations.json.gz"
 
-clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32", use_safetensors=True)
-clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+DATA_DIR = "data/objaverse_cache"
+
+# written by build_index.py
+OBJECT_EMB_FILE = "object_embeddings.npy"
+OBJECT_UIDS_FILE = "object_uids.json"
+OBJECT_INDEX_FILE = "object_index.faiss"
+
+QUERY_CACHE_SIZE = int(os.environ.get("GBLEND_QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_TTL = float(os.environ.get("GBLEND_QUERY_CACHE_TTL", "86400"))  # seconds, 0 = never expire
+# optional sqlite file so resolved queries survive restarts
+QUERY_CACHE_DB = os.environ.get("GBLEND_QUERY_CACHE_DB", "")
+
+# size cap of data/objaverse_cache/assets, least recently used GLBs are evicted first (0 = unbounded)
+ASSET_CACHE_MAX_MB = int(os.environ.get("GBLEND_ASSET_CACHE_MB", "20480"))
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = (5, 120)
+
+PREFETCH_WORKERS = int(os.environ.get("GBLEND_PREFETCH_WORKERS", "8"))
+PREFETCH_MAX_COUNT = 100  # per query / category
+PREFETCH_HISTORY = 100  # finished prefetch statuses kept for polling
+
+clip_model = CLIPModel.from_pretrained(CLIP_MODEL_NAME, use_safetensors=True)
+clip_processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
+clip_model.eval()
 
 
 app = FastAPI()
+
+
+@app.on_event("startup")
+def load_index():
+    get_index(DATA_DIR)
+
+
+@app.get("/search/")
+def search(query: str = Query(...), k: int = Query(10, ge=1, le=200)):
+    try:
+        return {"query": query, **resolve_query(DATA_DIR, query, k)}
+    except Exception as e:
+        logger.error(f"[Objaverse] Search failed: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.get("/cache/stats/")
+def cache_stats():
+    return {"queries": query_cache.stats(), "assets": get_asset_cache(DATA_DIR).stats()}
+
+
+@app.post("/prefetch/")
+def prefetch(request: dict = Body(...)):
+    """
+    Download GLBs for a list of queries / categories into the asset cache.
+    Returns the uids chosen per item; place them with /download_glb/?uid=.
+    {"items": [{"query": "chair", "count": 5}, {"category": "mug", "count": 3}], "count": 5}
+    "queries" / "categories" lists are accepted as shorthand, using "count" for each.
+    """
+    default_count = int(request.get("count", 5))
+    items = list(request.get("items", []))
+    items += [{"query": q} for q in request.get("queries", [])]
+    items += [{"category": c} for c in request.get("categories", [])]
+    if not items:
+        raise HTTPException(status_code=400, detail="No queries or categories given")
+
+    try:
+        targets, resolved = collect_prefetch_targets(DATA_DIR, items, default_count)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {**start_prefetch(DATA_DIR, targets), "items": resolved}
+
+
+@app.get("/prefetch/{prefetch_id}")
+def prefetch_status(prefetch_id: str):
+    with _prefetch_lock:
+        job = _prefetch_jobs.get(prefetch_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Prefetch not found")
+        return dict(job, files=list(job["files"]), errors=list(job["errors"]))
+
+
 @app.get("/download_glb/")
-def download_glb(query: str = Query(...)):
+def download_glb(query: str = Query(None), uid: str = Query(None)):
+    if not query and not uid:
+        return JSONResponse(status_code=400, content={"error": "query or uid is required"})
     try:
-        logger.info(f"[Objaverse] Searching GLB for query: {query}")
-        save_path = setup_objaverse("data/objaverse_cache", query)
+        if uid:
+            logger.info(f"[Objaverse] Fetching GLB for uid: {uid}")
+            save_path = setup_objaverse_uid(DATA_DIR, uid)
+        else:
+            logger.info(f"[Objaverse] Searching GLB for query: {query}")
+            save_path = setup_objaverse(DATA_DIR, query)
         return FileResponse(
             save_path,
             media_type="model/gltf-binary",
@@ -37,11 +131,21 @@ def download_glb(query: str = Query(...)):
     
 
 def download_file(url, dest_path):
+    """Stream url into a temp file next to dest_path, then rename it into place"""
     print(f"[Objaverse] Downloading: {url}")
-    response = requests.get(url)
-    response.raise_for_status()
-    with open(dest_path, "wb") as f:
-        f.write(response.content)
+    dest_dir = os.path.dirname(os.path.abspath(dest_path))
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".", suffix=".part")
+    try:
+        with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def unzip_gz(gz_path, out_path):
     with gzip.open(gz_path, 'rb') as f_in:
@@ -65,46 +169,514 @@ def ensure_metadata_files_exist(data_dir):
         download_file(LVIS_URL, lvis_file)
         unzip_gz(lvis_file, lvis_json)
 
+def encode_text(texts, batch_size=256):
+    """CLIP text features, L2-normalized, as a float32 (N, D) array"""
+    feats = []
+    with torch.no_grad():
+        for i in range(0, len(texts), batch_size):
+            inputs = clip_processor(text=texts[i:i + batch_size], return_tensors="pt", padding=True)
+            f = clip_model.get_text_features(**inputs)
+            feats.append(torch.nn.functional.normalize(f, dim=-1).cpu().numpy())
+    return np.concatenate(feats).astype(np.float32)
+
+
+class ObjaverseIndex:
+    """
+    LVIS / object-path metadata kept resident, plus the CLIP embeddings of all
+    LVIS category names. The embeddings are computed once, saved as a
+    normalized float16 .npy next to the metadata and memory-mapped afterwards.
+    """
+
+    def __init__(self, data_dir):
+        ensure_metadata_files_exist(data_dir)
+
+        with open(os.path.join(data_dir, "lvis-annotations.json"), 'r') as f:
+            self.category_to_uids = json.load(f)
+        with open(os.path.join(data_dir, "object-paths.json"), 'r') as f:
+            self.uid_to_path = json.load(f)
+
+        self.categories = list(self.category_to_uids.keys())
+        self.uid_to_category = {uid: c for c, uids in self.category_to_uids.items() for uid in uids}
+        self.category_embeddings = self._load_category_embeddings(data_dir)
+        self.objects = ObjectIndex.load(data_dir)
+
+    def _load_category_embeddings(self, data_dir):
+        emb_path = os.path.join(data_dir, "category_embeddings.npy")
+        meta_path = os.path.join(data_dir, "category_embeddings.json")
+
+        if os.path.exists(emb_path) and os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get("model") == CLIP_MODEL_NAME and meta.get("categories") == self.categories:
+                logger.info(f"[Objaverse] Loaded category embeddings: {emb_path}")
+                return np.load(emb_path, mmap_mode="r")
+            logger.info("[Objaverse] Category embeddings are stale, rebuilding")
+
+        logger.info(f"[Objaverse] Encoding {len(self.categories)} LVIS categories")
+        emb = encode_text(self.categories).astype(np.float16)
+
+        # tmp + rename so a crash never leaves a truncated index behind
+        tmp_path = emb_path + ".tmp.npy"
+        np.save(tmp_path, emb)
+        os.replace(tmp_path, emb_path)
+        with open(meta_path, 'w') as f:
+            json.dump({"model": CLIP_MODEL_NAME, "categories": self.categories}, f)
+        return np.load(emb_path, mmap_mode="r")
+
+    def rank_categories(self, q):
+        """Cosine similarity of an encoded query against every category"""
+        return self.category_embeddings @ q.astype(np.float16)
+
+    def glb_url(self, uid):
+        return f"https://huggingface.co/datasets/allenai/objaverse/resolve/main/{self.uid_to_path[uid]}"
+
+
+class ObjectIndex:
+    """Per-object CLIP embeddings (see build_index.py) with optional faiss ANN search"""
+
+    def __init__(self, uids, embeddings, ann=None):
+        self.uids = uids
+        self.embeddings = embeddings
+        self.ann = ann
+        if ann is not None:
+            if hasattr(ann, "nprobe"):
+                ann.nprobe = 16
+            if hasattr(ann, "hnsw"):
+                ann.hnsw.efSearch = 64
+
+    @classmethod
+    def load(cls, data_dir):
+        emb_path = os.path.join(data_dir, OBJECT_EMB_FILE)
+        uids_path = os.path.join(data_dir, OBJECT_UIDS_FILE)
+        if not (os.path.exists(emb_path) and os.path.exists(uids_path)):
+            logger.info("[Objaverse] No object index, run build_index.py to enable per-object search")
+            return None
+
+        with open(uids_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get("model") != CLIP_MODEL_NAME:
+            logger.warning(f"[Objaverse] Object index was built with {meta.get('model')}, ignoring it")
+            return None
+
+        embeddings = np.load(emb_path, mmap_mode="r")
+        ann = None
+        index_path = os.path.join(data_dir, OBJECT_INDEX_FILE)
+        if faiss is not None and os.path.exists(index_path):
+            ann = faiss.read_index(index_path)
+        logger.info(f"[Objaverse] Loaded object index: {len(meta['uids'])} objects ({'faiss' if ann else 'brute force'})")
+        return cls(meta["uids"], embeddings, ann)
+
+    def search(self, q, k):
+        """Top-k (row, score) for a normalized query vector"""
+        k = min(k, len(self.uids))
+        if self.ann is not None:
+            scores, rows = self.ann.search(q[None, :].astype(np.float32), k)
+            return [(int(r), float(s)) for r, s in zip(rows[0], scores[0]) if r >= 0]
+
+        sims = self.embeddings @ q.astype(np.float16)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(int(r), float(sims[r])) for r in top]
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of resolved queries (category, scores, candidate uids),
+    optionally written through to a small sqlite table.
+    """
+
+    def __init__(self, capacity=1024, ttl=86400, db_path=""):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (created, value), LRU order
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS queries (key TEXT PRIMARY KEY, created REAL, value TEXT)")
+            self._db.commit()
+
+    @staticmethod
+    def normalize(query):
+        return " ".join(query.lower().split())
+
+    def _expired(self, created):
+        return self.ttl > 0 and time.time() - created > self.ttl
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                self._metrics["expired"] += 1
+                entry = None
+
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT created, value FROM queries WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[0]):
+                    entry = (row[0], json.loads(row[1]))
+                    self._put_memory(key, entry)
+                    self._metrics["disk_hits"] += 1
+
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, key, value):
+        entry = (time.time(), value)
+        with self._lock:
+            self._put_memory(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO queries (key, created, value) VALUES (?, ?, ?)",
+                    (key, entry[0], json.dumps(value)),
+                )
+                if self.ttl > 0:
+                    self._db.execute("DELETE FROM queries WHERE created < ?", (time.time() - self.ttl,))
+                self._db.commit()
+
+    def _put_memory(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._metrics["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM queries")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "ttl": self.ttl,
+                "persistent": self._db is not None,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+            }
+
+
+query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL, QUERY_CACHE_DB)
+
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+
+def get_index(data_dir):
+    with _index_lock:
+        index = _indexes.get(data_dir)
+        if index is None:
+            index = ObjaverseIndex(data_dir)
+            _indexes[data_dir] = index
+        return index
+
+
+def resolve_query(data_dir, query: str, k=10):
+    """
+    Best LVIS category, top category scores and ranked candidate uids for a query.
+    Rankings are cached per normalized query, so repeats skip the CLIP encoder.
+    """
+    index = get_index(data_dir)
+    key = f"{QueryCache.normalize(query)}|{k}|{'objects' if index.objects is not None else 'categories'}"
+    result = query_cache.get(key)
+    if result is None:
+        q = encode_text([query])[0]
+        sims = index.rank_categories(q)
+        top = np.argsort(-sims)[:k]
+
+        result = {
+            "category": index.categories[int(top[0])],
+            "scores": [{"category": index.categories[c], "score": float(sims[c])} for c in top],
+        }
+        if index.objects is not None:
+            result["candidates"] = [
+                {"uid": index.objects.uids[row], "score": score, "category": index.uid_to_category.get(index.objects.uids[row])}
+                for row, score in index.objects.search(q, k)
+            ]
+        query_cache.put(key, result)
+
+    if index.objects is not None:
+        return result
+
+    # no object index: sample from the top categories on every call, only the ranking is cached
+    candidates = []
+    for entry in result["scores"]:
+        uids = index.category_to_uids[entry["category"]]
+        for uid in random.sample(uids, min(k - len(candidates), len(uids))):
+            candidates.append({"uid": uid, "score": entry["score"], "category": entry["category"]})
+        if len(candidates) >= k:
+            break
+    return dict(result, candidates=candidates)
+
+
+# per normalized query: uids prefetched for it and uids already handed out
+_query_pools = OrderedDict()
+_query_pool_lock = threading.Lock()
+
+
+def _query_pool(query):
+    """Caller holds _query_pool_lock"""
+    key = QueryCache.normalize(query)
+    pool = _query_pools.get(key)
+    if pool is None:
+        pool = _query_pools[key] = {"prefetched": [], "served": set()}
+        while len(_query_pools) > QUERY_CACHE_SIZE:
+            _query_pools.popitem(last=False)
+    _query_pools.move_to_end(key)
+    return pool
+
+
+def remember_prefetched(query, uids):
+    with _query_pool_lock:
+        prefetched = _query_pool(query)["prefetched"]
+        prefetched += [uid for uid in uids if uid not in prefetched]
+
+
+def uid_category(index, uid):
+    return index.uid_to_category.get(uid, "uncategorized")
+
+
 def get_random_glb_url_from_query(data_dir, query: str):
-    ensure_metadata_files_exist(data_dir)
+    """
+    Objects prefetched for the query (or cached in its category) are handed out
+    first, each once, so placements after a prefetch are served from disk.
+    After that uids are sampled uniformly from the best category.
+    """
+    index = get_index(data_dir)
+    cache = get_asset_cache(data_dir)
 
-    lvis_json = os.path.join(data_dir, "lvis-annotations.json")
-    obj_path_json = os.path.join(data_dir, "object-paths.json")
+    best_category = resolve_query(data_dir, query)["category"]
+    with _query_pool_lock:
+        pool = _query_pool(query)
+        on_disk = [
+            uid for uid in dict.fromkeys(pool["prefetched"] + sorted(cache.cached_uids(best_category)))
+            if uid not in pool["served"] and os.path.exists(cache.path_for(uid_category(index, uid), uid))
+        ]
+        uid = on_disk[0] if on_disk else random.choice(index.category_to_uids[best_category])
+        pool["served"].add(uid)
 
-    with open(lvis_json, 'r') as f:
-        category_to_uids = json.load(f)
-    with open(obj_path_json, 'r') as f:
-        uid_to_path = json.load(f)
+    url = index.glb_url(uid)
+    return url, uid_category(index, uid), uid
 
-    categories = list(category_to_uids.keys())
-    inputs = clip_processor(text=[query] + categories, return_tensors="pt", padding=True)
+class AssetCache:
+    """
+    GLB files under <data_dir>/assets/<category>/<uid>.glb.
+    Downloads are single-flight per uid, and the directory is kept under
+    max_mb by evicting the least recently accessed files.
+    """
 
-    with torch.no_grad():
-        feats = clip_model.get_text_features(**inputs)
+    def __init__(self, root, max_mb=0):
+        self.root = root
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._uid_locks = {}  # uid -> [lock, waiters]
+        os.makedirs(root, exist_ok=True)
+        self._remove_partial_files()
+
+    def _remove_partial_files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".part"):
+                    os.remove(os.path.join(dirpath, name))
+
+    def _acquire(self, uid):
+        with self._lock:
+            entry = self._uid_locks.setdefault(uid, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+
+    def _release(self, uid):
+        with self._lock:
+            entry = self._uid_locks[uid]
+            entry[0].release()
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._uid_locks[uid]
 
-    sims = torch.nn.functional.cosine_similarity(feats[0], feats[1:])
-    best_category = categories[sims.argmax().item()]
-    uid = random.choice(category_to_uids[best_category])
-    url = f"https://huggingface.co/datasets/allenai/objaverse/resolve/main/{uid_to_path[uid]}"
-    return url, best_category, uid
+    def path_for(self, category, uid):
+        return os.path.join(self.root, category, f"{uid}.glb")
 
-def download_glb(save_path, url):
-    if os.path.exists(save_path):
-        print(f"[INFO] File already exists: {save_path}")
+    def fetch(self, url, category, uid):
+        save_path = self.path_for(category, uid)
+        self._acquire(uid)
+        try:
+            if os.path.exists(save_path):
+                print(f"[INFO] File already exists: {save_path}")
+                os.utime(save_path)  # access time drives eviction
+                return save_path
+
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            download_file(url, save_path)
+            print(f"[INFO] Downloaded: {save_path}")
+        finally:
+            self._release(uid)
+
+        self.evict(keep=save_path)
         return save_path
 
-    response = requests.get(url)
-    with open(save_path, 'wb') as f:
-        f.write(response.content)
-    print(f"[INFO] Downloaded: {save_path}")
-    return save_path
+    def cached_uids(self, category):
+        category_dir = os.path.join(self.root, category)
+        if not os.path.isdir(category_dir):
+            return []
+        return [name[:-4] for name in os.listdir(category_dir) if name.endswith(".glb")]
+
+    def evict(self, keep=None):
+        if self.max_bytes <= 0:
+            return
+
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".glb"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return
+
+        files.sort()
+        with self._lock:
+            busy = set(self._uid_locks)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep or os.path.splitext(os.path.basename(path))[0] in busy:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            logger.info(f"[Objaverse] Evicted {path} ({size / 1e6:.1f} MB)")
+
+    def stats(self):
+        count, total = 0, 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".glb"):
+                    count += 1
+                    total += os.path.getsize(os.path.join(dirpath, name))
+        return {"files": count, "size_mb": total / 1024 / 1024, "max_mb": self.max_bytes / 1024 / 1024}
+
+
+_asset_caches = {}
+
+
+def get_asset_cache(data_dir):
+    with _index_lock:
+        cache = _asset_caches.get(data_dir)
+        if cache is None:
+            cache = AssetCache(os.path.join(data_dir, "assets"), ASSET_CACHE_MAX_MB)
+            _asset_caches[data_dir] = cache
+        return cache
+
+def setup_objaverse_uid(data_dir, uid: str):
+    index = get_index(data_dir)
+    if uid not in index.uid_to_path:
+        raise KeyError(f"Unknown uid: {uid}")
+    category = uid_category(index, uid)
+    return save_glb(data_dir, index.glb_url(uid), category, uid)
 
 def setup_objaverse(data_dir, query: str):
     url, category, uid = get_random_glb_url_from_query(data_dir, query)
+    return save_glb(data_dir, url, category, uid)
+
+def save_glb(data_dir, url, category, uid):
+    return get_asset_cache(data_dir).fetch(url, category, uid)
+
+
+_prefetch_jobs = {}
+_prefetch_lock = threading.Lock()
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+
+
+def collect_prefetch_targets(data_dir, items, default_count=5):
+    """
+    Resolve prefetch items to unique (uid, category) pairs, plus the uids
+    chosen for each item so clients can place them with /download_glb/?uid=
+    """
+    index = get_index(data_dir)
+    targets = {}
+    resolved = []
+
+    for item in items:
+        count = max(1, min(int(item.get("count", default_count)), PREFETCH_MAX_COUNT))
+        if item.get("category"):
+            category = item["category"]
+            if category not in index.category_to_uids:
+                raise KeyError(f"Unknown category: {category}")
+            uids = random.sample(index.category_to_uids[category], min(count, len(index.category_to_uids[category])))
+            resolved.append({"category": category, "uids": uids})
+        elif item.get("query"):
+            uids = [c["uid"] for c in resolve_query(data_dir, item["query"], count)["candidates"]]
+            # later /download_glb/?query= calls hand these out first
+            remember_prefetched(item["query"], uids)
+            resolved.append({"query": item["query"], "uids": uids})
+        else:
+            continue
+        for uid in uids:
+            targets[uid] = uid_category(index, uid)
+
+    return list(targets.items()), resolved
+
+
+def start_prefetch(data_dir, targets):
+    """Queue downloads on the shared worker pool; progress is kept in _prefetch_jobs"""
+    index = get_index(data_dir)
+    cache = get_asset_cache(data_dir)
+    prefetch_id = uuid.uuid4().hex[:12]
+    job = {
+        "prefetch_id": prefetch_id,
+        "status": "running",
+        "total": len(targets),
+        "done": 0,
+        "failed": 0,
+        "files": [],
+        "errors": [],
+    }
+    with _prefetch_lock:
+        finished = [k for k, j in _prefetch_jobs.items() if j["status"] == "done"]
+        for k in finished[:max(0, len(finished) - PREFETCH_HISTORY)]:
+            del _prefetch_jobs[k]
+        _prefetch_jobs[prefetch_id] = job
+
+    def fetch_one(uid, category):
+        try:
+            path = cache.fetch(index.glb_url(uid), category, uid)
+            result = ("files", {"uid": uid, "category": category, "path": os.path.relpath(path, data_dir)})
+        except Exception as e:
+            logger.error(f"[Objaverse] Prefetch failed for {uid}: {e}")
+            result = ("errors", {"uid": uid, "error": str(e)})
+
+        with _prefetch_lock:
+            job[result[0]].append(result[1])
+            job["done" if result[0] == "files" else "failed"] += 1
+            if job["done"] + job["failed"] == job["total"]:
+                job["status"] = "done"
 
-    asset_dir = os.path.join(data_dir, "assets")
-    save_dir = os.path.join(asset_dir, category)
-    os.makedirs(save_dir, exist_ok=True)
+    if not targets:
+        job["status"] = "done"
+    for uid, category in targets:
+        _prefetch_pool.submit(fetch_one, uid, category)
 
-    save_path = os.path.join(save_dir, f"{uid}.glb")
-    return download_glb(save_path, url)
\ No newline at end of file
+    logger.info(f"[Objaverse] Prefetch {prefetch_id}: {len(targets)} objects queued")
+    return {"prefetch_id": prefetch_id, "total": len(targets)}
@@ -0,0 +1,192 @@
+"""
+Offline per-object CLIP index for Objaverse retrieval.
+
+    python build_index.py --source names
+    python build_index.py --source thumbnails --limit 100000
+
+Each object is embedded from its name/tags (CLIP text encoder) or its
+thumbnail (CLIP image encoder). Writes into the data dir:
+    object_embeddings.npy   normalized float16 (N, D)
+    object_uids.json        row -> uid
+    object_index.faiss      IVF / HNSW index (only if faiss is installed)
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+import torch
+from PIL import Image
+
+from app import (
+    CLIP_MODEL_NAME,
+    DATA_DIR,
+    OBJECT_EMB_FILE,
+    OBJECT_INDEX_FILE,
+    OBJECT_UIDS_FILE,
+    clip_model,
+    clip_processor,
+    encode_text,
+    ensure_metadata_files_exist,
+    faiss,
+    logger,
+)
+
+METADATA_URL = "https://huggingface.co/datasets/allenai/objaverse/resolve/main/metadata/{shard}.json.gz"
+
+
+def load_metadata_shard(data_dir, shard):
+    """Per-object annotations (name, tags, thumbnails) of one shard, cached on disk"""
+    meta_dir = os.path.join(data_dir, "metadata")
+    os.makedirs(meta_dir, exist_ok=True)
+    path = os.path.join(meta_dir, f"{shard}.json.gz")
+
+    if not os.path.exists(path):
+        response = requests.get(METADATA_URL.format(shard=shard), timeout=60)
+        response.raise_for_status()
+        with open(path + ".tmp", "wb") as f:
+            f.write(response.content)
+        os.replace(path + ".tmp", path)
+
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+
+def object_text(annotation, category=None):
+    parts = [annotation.get("name") or ""]
+    parts += [t["name"] for t in annotation.get("tags", [])[:8]]
+    if category:
+        parts.append(category.replace("_", " "))
+    return ", ".join(p for p in parts if p)[:200]
+
+
+def thumbnail_url(annotation, min_width=224):
+    images = annotation.get("thumbnails", {}).get("images", [])
+    images = sorted(images, key=lambda im: im.get("width", 0))
+    for im in images:
+        if im.get("width", 0) >= min_width:
+            return im["url"]
+    return images[-1]["url"] if images else None
+
+
+def fetch_image(url):
+    try:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return Image.open(io.BytesIO(response.content)).convert("RGB")
+    except Exception as e:
+        logger.warning(f"[Objaverse] Thumbnail failed: {url} ({e})")
+        return None
+
+
+def encode_images(images):
+    with torch.no_grad():
+        inputs = clip_processor(images=images, return_tensors="pt")
+        f = clip_model.get_image_features(**inputs)
+        return torch.nn.functional.normalize(f, dim=-1).cpu().numpy().astype(np.float32)
+
+
+def collect_objects(data_dir, lvis_only=True, limit=None):
+    """(uid, category or None) pairs grouped by metadata shard"""
+    with open(os.path.join(data_dir, "lvis-annotations.json"), "r") as f:
+        category_to_uids = json.load(f)
+    with open(os.path.join(data_dir, "object-paths.json"), "r") as f:
+        uid_to_path = json.load(f)
+
+    uid_to_category = {uid: c for c, uids in category_to_uids.items() for uid in uids}
+    uids = list(uid_to_category) if lvis_only else list(uid_to_path)
+    if limit:
+        uids = uids[:limit]
+
+    shards = defaultdict(list)
+    for uid in uids:
+        # glbs/000-023/<uid>.glb -> 000-023
+        shards[uid_to_path[uid].split("/")[1]].append((uid, uid_to_category.get(uid)))
+    return shards
+
+
+def embed_objects(data_dir, shards, source="names", batch_size=256, workers=16):
+    uids, feats = [], []
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    for i, (shard, objects) in enumerate(sorted(shards.items())):
+        metadata = load_metadata_shard(data_dir, shard)
+        objects = [(uid, c) for uid, c in objects if uid in metadata]
+
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start:start + batch_size]
+            if source == "thumbnails":
+                urls = [thumbnail_url(metadata[uid]) for uid, _ in batch]
+                images = list(pool.map(lambda u: fetch_image(u) if u else None, urls))
+                batch = [o for o, im in zip(batch, images) if im is not None]
+                images = [im for im in images if im is not None]
+                if not images:
+                    continue
+                feats.append(encode_images(images))
+            else:
+                feats.append(encode_text([object_text(metadata[uid], c) for uid, c in batch]))
+            uids += [uid for uid, _ in batch]
+
+        logger.info(f"[Objaverse] Shard {i + 1}/{len(shards)} ({shard}): {len(uids)} objects embedded")
+
+    pool.shutdown()
+    return uids, np.concatenate(feats)
+
+
+def build_ann_index(emb, kind="auto"):
+    """Inner-product ANN index over normalized embeddings (IVF for large N, else HNSW)"""
+    n, d = emb.shape
+    if kind == "auto":
+        kind = "ivf" if n >= 50_000 else "hnsw"
+
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 80
+    else:
+        nlist = int(4 * np.sqrt(n))
+        quantizer = faiss.IndexFlatIP(d)
+        index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(emb)
+    index.add(emb)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the per-object CLIP index for Objaverse search")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--source", choices=["names", "thumbnails"], default="names")
+    parser.add_argument("--all-objects", action="store_true", help="index all Objaverse objects, not only LVIS")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--index", choices=["auto", "ivf", "hnsw", "none"], default="auto")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    ensure_metadata_files_exist(args.data_dir)
+    shards = collect_objects(args.data_dir, lvis_only=not args.all_objects, limit=args.limit)
+    uids, emb = embed_objects(args.data_dir, shards, source=args.source, batch_size=args.batch_size)
+
+    emb_path = os.path.join(args.data_dir, OBJECT_EMB_FILE)
+    np.save(emb_path + ".tmp.npy", emb.astype(np.float16))
+    os.replace(emb_path + ".tmp.npy", emb_path)
+    with open(os.path.join(args.data_dir, OBJECT_UIDS_FILE), "w") as f:
+        json.dump({"model": CLIP_MODEL_NAME, "source": args.source, "uids": uids}, f)
+    logger.info(f"[Objaverse] Saved {len(uids)} embeddings: {emb_path}")
+
+    index_path = os.path.join(args.data_dir, OBJECT_INDEX_FILE)
+    if args.index != "none" and faiss is not None:
+        index = build_ann_index(emb, args.index)
+        faiss.write_index(index, index_path)
+        logger.info(f"[Objaverse] Saved ANN index: {index_path}")
+    else:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        logger.info("[Objaverse] No ANN index written, search falls back to brute force")
+
+
+if __name__ == "__main__":
+    main()